@@ -6,6 +6,19 @@ This package provides tools for testing LLM integration before
 incorporating into the main notion_to_hexo workflow.
 """
 
-from .summary_generator import generate_summary
+__all__ = [
+    'generate_summary',
+    'agenerate_summary',
+    'generate_summaries_batch',
+    'generate_summaries_combined',
+    'prewarm_connection',
+    'LLMConfig',
+]
 
-__all__ = ['generate_summary']
+
+def __getattr__(name):
+    # Import summary_generator (and dashscope with it) only when used
+    if name in __all__:
+        from . import summary_generator
+        return getattr(summary_generator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
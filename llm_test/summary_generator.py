@@ -3,7 +3,7 @@
 Summary Generator - 使用阿里云百炼 API 生成文章摘要
 
 Usage:
-    python summary_generator.py <file_path>
+    python summary_generator.py <file_path> [<file_path> ...]
 
 Example:
     python summary_generator.py ../test/sample_article.md
@@ -11,133 +11,788 @@ Example:
 
 import os
 import sys
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import asyncio
+import codecs
+import random
+import inspect
+import contextlib
+import threading
+import functools
+from dataclasses import dataclass
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    load_dotenv = None
+import requests
+from requests.adapters import HTTPAdapter
 
-try:
-    from dashscope import Generation
-except ImportError:
-    Generation = None
+DEFAULT_MAX_CONCURRENCY = 5
+MAX_CONTENT_TOKENS = 3500  # Content sent to the API is limited to this many tokens
+MAX_CONTENT_CHARS = 4000   # Character limit used when no tokenizer is available
+# Longest prefix that can matter for the token budget; only this much is
+# tokenized (a token covers far fewer characters than this on average)
+MAX_SCAN_CHARS = MAX_CONTENT_TOKENS * 8
+DASHSCOPE_BASE_URL = 'https://dashscope.aliyuncs.com/'
+_TITLE_TRANS = str.maketrans('-_', '  ')  # Filename separators -> spaces
 
+# Prompt text is fixed; only the title and content at the end vary per
+# article, so requests share the longest possible identical prefix
+# (which DashScope's context cache can reuse)
+_SYSTEM_PROMPT = "你是一个专业的内容编辑，擅长为博客文章撰写吸引人的摘要。请直接输出摘要内容，不需要任何前缀或解释。"
+_USER_TEMPLATE = """请为以下文章生成一段简洁的摘要（150-250字），用于博客文章的description字段。
+摘要应该：
+1. 概括文章的主要内容和核心观点
+2. 吸引读者继续阅读
+3. 使用与文章相同的语言（中文文章用中文，英文文章用英文）
+4. 避免使用数学符号或特殊字符
+
+{title_context}内容：
+{content}"""
+
+# Several short articles can share one request; each gets a shorter excerpt
+# and the model answers with a JSON array of per-article summaries
+COMBINED_BATCH_SIZE = 8
+COMBINED_ITEM_CHARS = 2000
+_COMBINED_SYSTEM_PROMPT = "你是一个专业的内容编辑，擅长为博客文章撰写吸引人的摘要。请严格按照要求的 JSON 格式输出，不需要任何前缀或解释。"
+_COMBINED_TEMPLATE = """请为以下 {count} 篇文章分别生成一段简洁的摘要（150-250字），用于博客文章的description字段。
+每篇摘要应该：
+1. 概括文章的主要内容和核心观点
+2. 吸引读者继续阅读
+3. 使用与文章相同的语言（中文文章用中文，英文文章用英文）
+4. 避免使用数学符号或特殊字符
+
+只输出一个 JSON 数组，格式为：[{{"i": 文章编号, "summary": "摘要"}}, ...]
+
+{articles}"""
+
+# Local cache of generated summaries, keyed on model + prompt
+SUMMARY_CACHE_PATH = Path.home() / '.cache' / 'notion_to_hexo' / 'llm_summaries.db'
+SUMMARY_CACHE_TTL = 30 * 86400  # seconds
+
+# Rate limiting and retry of throttled requests
+REQUESTS_PER_MINUTE = 300
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0   # seconds
+RETRY_MAX_DELAY = 30.0   # seconds
+RETRY_JITTER = 1.0       # seconds
+
+
+class _RateLimiter:
+    """
+    Spaces requests evenly so no more than `rate` start per `period` seconds.
+
+    Callers reserve the next free slot before sending, so a burst of
+    concurrent requests is smoothed out instead of being rejected by the
+    API and retried.
+    """
+
+    def __init__(self, rate, period=60.0):
+        self._interval = period / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Reserve a slot and return how long to wait until it starts."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+            return slot - now
+
+    def wait(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_rate_limiter = _RateLimiter(REQUESTS_PER_MINUTE)
+
+
+def _is_retryable(response) -> bool:
+    """Whether a failed response is a throttling or transient server error."""
+    status = response.status_code
+    code = getattr(response, 'code', '') or ''
+    return status == 429 or status >= 500 or code.startswith('Throttling')
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given zero-based attempt."""
+    delay = RETRY_BASE_DELAY * 2 ** attempt + random.random() * RETRY_JITTER
+    return min(delay, RETRY_MAX_DELAY)
+
+
+# Shared HTTP session so back-to-back calls reuse pooled keep-alive connections
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Return the process-wide pooled session used for DashScope requests."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                atexit.register(session.close)
+                _session = session
+    return _session
+
+
+@functools.lru_cache(maxsize=1)
+def _generation_api():
+    """Import dashscope's Generation on first use, or return None if missing."""
+    try:
+        from dashscope import Generation
+    except ImportError:
+        return None
+    return Generation
+
+
+@functools.lru_cache(maxsize=1)
+def _aio_generation_api():
+    """Import dashscope's AioGeneration on first use, or return None if missing."""
+    try:
+        from dashscope import AioGeneration
+    except ImportError:
+        # Older dashscope releases have no async client
+        return None
+    return AioGeneration
+
+
+@functools.lru_cache(maxsize=1)
+def _sdk_accepts_session() -> bool:
+    """Check whether the installed dashscope SDK accepts a custom session."""
+    try:
+        from dashscope.api_entities.api_request_factory import _build_api_request
+    except ImportError:
+        return False
+    return 'session' in inspect.signature(_build_api_request).parameters
+
+
+def _session_kwargs() -> dict:
+    """Extra Generation.call kwargs that route the request through the shared session."""
+    if _sdk_accepts_session():
+        return {'session': _get_session()}
+    return {}
+
+
+def prewarm_connection():
+    """
+    Open a connection to DashScope in the background.
+
+    Fires a HEAD request on a daemon thread so DNS resolution and the TLS
+    handshake are done by the time the first summary request is sent; the
+    warmed socket stays in the shared session's pool and is reused.
+    No-op when the installed SDK cannot use the shared session.
+    """
+    if not _sdk_accepts_session():
+        return
 
+    def _warm():
+        try:
+            _get_session().head(DASHSCOPE_BASE_URL, timeout=5)
+        except requests.RequestException:
+            pass
+
+    threading.Thread(target=_warm, daemon=True).start()
+
+
+@functools.lru_cache(maxsize=1)
 def load_api_key():
-    """Load DASHSCOPE_API_KEY from environment or .env file."""
+    """
+    Load DASHSCOPE_API_KEY from environment or .env file.
+
+    The result is cached, so the .env lookup and parse happen once per
+    process. Call load_api_key.cache_clear() after changing the key.
+    """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        load_dotenv = None
+
     # Try to load from .env file
     if load_dotenv:
         # Look for .env in current dir and parent dir
-        env_paths = [
-            Path.cwd() / '.env',
-            Path(__file__).parent.parent / '.env',
-        ]
+        env_paths = (
+            os.path.join(os.getcwd(), '.env'),
+            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'),
+        )
         for env_path in env_paths:
-            if env_path.exists():
-                load_dotenv(env_path)
-                break
+            try:
+                os.stat(env_path)
+            except OSError:
+                continue
+            load_dotenv(env_path)
+            break
 
     api_key = os.getenv('DASHSCOPE_API_KEY')
     return api_key
 
 
-def generate_summary(content: str, title: str = None, model: str = 'qwen-turbo') -> str:
+@dataclass(frozen=True, slots=True)
+class LLMConfig:
     """
-    Generate a summary for the given content using Aliyun 百炼 API.
+    Settings for summary requests, resolved once and passed to each call.
 
-    Args:
-        content: The article content to summarize
-        title: Optional title for context
-        model: Model to use ('qwen-turbo' for fast, 'qwen-plus' for quality)
+    Passing a config skips the API key lookup on every call and lets tests
+    inject a key without touching the environment.
+    """
+    api_key: str
+    model: str = 'qwen-turbo'
 
-    Returns:
-        Generated summary text
+    @classmethod
+    def from_env(cls, model: str = 'qwen-turbo') -> 'LLMConfig':
+        """Build a config with the key from load_api_key()."""
+        return cls(api_key=load_api_key(), model=model)
 
-    Raises:
-        RuntimeError: If API key is missing or API call fails
+
+@functools.lru_cache(maxsize=4)
+def _get_tokenizer(model: str):
+    """Load the local Qwen tokenizer for a model, or None if unavailable."""
+    try:
+        from dashscope import get_tokenizer
+        return get_tokenizer(model)
+    except Exception:
+        # dashscope/tiktoken missing, or not a Qwen model
+        return None
+
+
+def _truncate_content(content: str, model: str) -> str:
+    """
+    Cut content to the prompt budget.
+
+    Counts tokens with the model's tokenizer when it is available, so
+    Chinese and English text get the same real budget. Falls back to a
+    plain character limit otherwise.
     """
-    if Generation is None:
+    tokenizer = _get_tokenizer(model)
+    if tokenizer is None:
+        return content[:MAX_CONTENT_CHARS]
+
+    token_ids = tokenizer.encode(content[:MAX_SCAN_CHARS])
+    if len(token_ids) <= MAX_CONTENT_TOKENS:
+        return content[:MAX_SCAN_CHARS]
+    # errors='ignore' drops a character split at the token boundary
+    return tokenizer.decode(token_ids[:MAX_CONTENT_TOKENS], errors='ignore')
+
+
+def _build_messages(content: str, title: str = None, model: str = 'qwen-turbo') -> list:
+    """Build the chat messages for a summary request."""
+    title_context = f"标题：{title}\n\n" if title else ""
+    user_prompt = _USER_TEMPLATE.format(
+        title_context=title_context,
+        content=_truncate_content(content, model),  # Limit content length for API
+    )
+
+    return [
+        {'role': 'system', 'content': _SYSTEM_PROMPT},
+        {'role': 'user', 'content': user_prompt}
+    ]
+
+
+def _cache_key(model: str, messages: list) -> str:
+    """Hash the model and messages into a stable cache key."""
+    payload = json.dumps({'model': model, 'messages': messages},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _open_cache() -> sqlite3.Connection:
+    SUMMARY_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(SUMMARY_CACHE_PATH)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS summaries '
+        '(key TEXT PRIMARY KEY, summary TEXT NOT NULL, created_at REAL NOT NULL)'
+    )
+    return conn
+
+
+def _cache_get(key: str):
+    """Return a cached summary, or None if missing or expired."""
+    try:
+        with contextlib.closing(_open_cache()) as conn:
+            row = conn.execute(
+                'SELECT summary FROM summaries WHERE key = ? AND created_at > ?',
+                (key, time.time() - SUMMARY_CACHE_TTL),
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def _cache_put(key: str, summary: str):
+    """Store a summary; cache failures are never fatal."""
+    try:
+        with contextlib.closing(_open_cache()) as conn, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO summaries (key, summary, created_at) VALUES (?, ?, ?)',
+                (key, summary, time.time()),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def _require_api_key(config: LLMConfig = None) -> str:
+    """Return the API key, raising RuntimeError if dashscope or the key is missing."""
+    if _generation_api() is None:
         raise RuntimeError(
             "dashscope package not installed. "
             "Run: pip install dashscope"
         )
 
-    api_key = load_api_key()
+    api_key = config.api_key if config is not None else load_api_key()
     if not api_key:
         raise RuntimeError(
             "DASHSCOPE_API_KEY not found. "
             "Set it in .env file or environment variable."
         )
+    return api_key
 
-    # Build the prompt
-    title_context = f"标题：{title}\n\n" if title else ""
-    user_prompt = f"""请为以下文章生成一段简洁的摘要（150-250字），用于博客文章的description字段。
-摘要应该：
-1. 概括文章的主要内容和核心观点
-2. 吸引读者继续阅读
-3. 使用与文章相同的语言（中文文章用中文，英文文章用英文）
-4. 避免使用数学符号或特殊字符
 
-{title_context}内容：
-{content[:4000]}"""  # Limit content length for API
+def _extract_summary(response) -> str:
+    """Extract the summary text from a DashScope response."""
+    if response.status_code == 200:
+        summary = response.output.choices[0].message.content
+        return summary.strip()
+    raise RuntimeError(
+        f"API call failed: {response.code} - {response.message}"
+    )
+
+
+def _call_with_retry(api_key: str, model: str, messages: list):
+    """Send a non-streaming request, retrying throttling, 5xx responses and timeouts."""
+    for attempt in range(MAX_ATTEMPTS):
+        _rate_limiter.wait()
+        try:
+            response = _generation_api().call(
+                api_key=api_key,
+                model=model,
+                messages=messages,
+                result_format='message',
+                **_session_kwargs()
+            )
+        except (requests.Timeout, requests.ConnectionError):
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+        else:
+            if response.status_code == 200 or not _is_retryable(response):
+                break
+        if attempt < MAX_ATTEMPTS - 1:
+            time.sleep(_backoff_delay(attempt))
+    return response
+
+
+def _call_streaming(api_key: str, model: str, messages: list, on_chunk):
+    """
+    Stream a summary, passing each text delta to on_chunk as it arrives.
+
+    Returns:
+        (response, text): the last response chunk received (None if the
+        stream was empty) and the accumulated text
+    """
+    responses = _generation_api().call(
+        api_key=api_key,
+        model=model,
+        messages=messages,
+        result_format='message',
+        stream=True,
+        incremental_output=True,
+        **_session_kwargs()
+    )
+    parts = []
+    response = None
+    for response in responses:
+        if response.status_code != 200:
+            break
+        delta = response.output.choices[0].message.content
+        if delta:
+            parts.append(delta)
+            on_chunk(delta)
+    return response, ''.join(parts)
+
 
-    system_prompt = "你是一个专业的内容编辑，擅长为博客文章撰写吸引人的摘要。请直接输出摘要内容，不需要任何前缀或解释。"
+def generate_summary(content: str, title: str = None, model: str = 'qwen-turbo',
+                     use_cache: bool = True, on_chunk=None, config: LLMConfig = None) -> str:
+    """
+    Generate a summary for the given content using Aliyun 百炼 API.
 
+    Summaries are cached on disk (see SUMMARY_CACHE_PATH), so re-running on
+    an unchanged article returns the previous result without an API call.
+
+    Args:
+        content: The article content to summarize
+        title: Optional title for context
+        model: Model to use ('qwen-turbo' for fast, 'qwen-plus' for quality)
+        use_cache: Read and write the local summary cache
+        on_chunk: Optional callback receiving text as it is generated. When
+                  given, the response is streamed, so output starts at the
+                  first token instead of after the full message. A cached
+                  summary is passed as a single chunk.
+        config: Optional LLMConfig supplying the API key and model (its
+                model takes precedence over the model argument)
+
+    Returns:
+        Generated summary text
+
+    Raises:
+        RuntimeError: If API key is missing or API call fails
+    """
+    if config is not None:
+        model = config.model
+    messages = _build_messages(content, title, model)
+    key = _cache_key(model, messages)
+    if use_cache:
+        cached = _cache_get(key)
+        if cached is not None:
+            if on_chunk is not None:
+                on_chunk(cached)
+            return cached
+
+    api_key = _require_api_key(config)
+
+    text = ''
     try:
-        response = Generation.call(
-            api_key=api_key,
-            model=model,
-            messages=[
-                {'role': 'system', 'content': system_prompt},
-                {'role': 'user', 'content': user_prompt}
-            ],
-            result_format='message'
-        )
+        if on_chunk is None:
+            response = _call_with_retry(api_key, model, messages)
+        else:
+            for attempt in range(MAX_ATTEMPTS):
+                _rate_limiter.wait()
+                response, text = _call_streaming(api_key, model, messages, on_chunk)
+                if response is None:
+                    raise RuntimeError("empty response stream")
+                # Text already handed to on_chunk cannot be taken back,
+                # so a stream that fails part-way is not retried
+                if text or response.status_code == 200 or not _is_retryable(response):
+                    break
+                if attempt < MAX_ATTEMPTS - 1:
+                    time.sleep(_backoff_delay(attempt))
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to generate summary: {e}") from e
+
+    if on_chunk is not None:
+        if response.status_code != 200:
+            _extract_summary(response)
+        summary = text.strip()
+    else:
+        summary = _extract_summary(response)
+    if use_cache:
+        _cache_put(key, summary)
+    return summary
+
+
+async def agenerate_summary(content: str, title: str = None, model: str = 'qwen-turbo',
+                            sem: asyncio.Semaphore = None, use_cache: bool = True,
+                            config: LLMConfig = None) -> str:
+    """
+    Async variant of generate_summary().
+
+    Uses dashscope's AioGeneration when available; older SDKs fall back to
+    running the synchronous call in a worker thread.
+
+    Args:
+        content: The article content to summarize
+        title: Optional title for context
+        model: Model to use
+        sem: Optional semaphore bounding the number of in-flight requests
+        use_cache: Read and write the local summary cache
+        config: Optional LLMConfig supplying the API key and model
+
+    Returns:
+        Generated summary text
+
+    Raises:
+        RuntimeError: If API key is missing or API call fails
+    """
+    if config is not None:
+        model = config.model
+    messages = _build_messages(content, title, model)
+    key = _cache_key(model, messages)
+    if use_cache:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+    if sem is None:
+        sem = asyncio.Semaphore(1)
+
+    async with sem:
+        aio_generation = _aio_generation_api()
+        if aio_generation is None:
+            return await asyncio.to_thread(
+                generate_summary, content, title, model, use_cache, config=config,
+            )
+
+        api_key = _require_api_key(config)
+        try:
+            for attempt in range(MAX_ATTEMPTS):
+                await _rate_limiter.wait_async()
+                response = await aio_generation.call(
+                    api_key=api_key,
+                    model=model,
+                    messages=messages,
+                    result_format='message'
+                )
+                if response.status_code == 200 or not _is_retryable(response):
+                    break
+                if attempt < MAX_ATTEMPTS - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate summary: {e}") from e
+        summary = _extract_summary(response)
+        if use_cache:
+            _cache_put(key, summary)
+        return summary
+
+
+async def _agenerate_batch(items, model, max_concurrency, use_cache=True, config=None):
+    sem = asyncio.Semaphore(max_concurrency)
+    return await asyncio.gather(
+        *(agenerate_summary(content, title, model, sem, use_cache, config) for title, content in items),
+        return_exceptions=True,
+    )
+
+
+def generate_summaries_batch(items, model: str = 'qwen-turbo',
+                             max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                             config: LLMConfig = None) -> list:
+    """
+    Generate summaries for several articles concurrently.
+
+    Requests are fanned out with asyncio.gather, bounded by a semaphore,
+    so total latency is close to the slowest request instead of the sum.
+
+    Args:
+        items: Iterable of (title, content) tuples
+        model: Model to use
+        max_concurrency: Maximum number of in-flight API requests
+        config: Optional LLMConfig supplying the API key and model
+
+    Returns:
+        List of results in input order. Each entry is the summary text,
+        or the RuntimeError raised for that article.
+    """
+    return asyncio.run(_agenerate_batch(list(items), model, max_concurrency, config=config))
+
+
+def _build_combined_messages(items) -> list:
+    """Build one request asking for summaries of several (title, content) items."""
+    articles = "\n".join(
+        f"第{i}篇\n标题：{title or '无'}\n内容：\n{content[:COMBINED_ITEM_CHARS]}\n"
+        for i, (title, content) in enumerate(items)
+    )
+    user_prompt = _COMBINED_TEMPLATE.format(count=len(items), articles=articles)
+    return [
+        {'role': 'system', 'content': _COMBINED_SYSTEM_PROMPT},
+        {'role': 'user', 'content': user_prompt}
+    ]
+
+
+def _combined_cache_key(model: str, title: str, content: str) -> str:
+    """Cache key for one article's summary from a combined request."""
+    return _cache_key(model, _build_combined_messages([(title, content)]))
+
+
+def _parse_combined_summaries(text: str, count: int) -> dict:
+    """
+    Parse the JSON array returned for a combined request.
+
+    Returns:
+        Dict mapping item index to summary; malformed or missing entries
+        are left out
+    """
+    text = text.strip()
+    if text.startswith('```'):
+        # Strip a markdown code fence around the JSON
+        text = text.split('\n', 1)[-1].rsplit('```', 1)[0]
+    try:
+        entries = json.loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(entries, list):
+        return {}
+
+    summaries = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get('i'))
+        except (TypeError, ValueError):
+            continue
+        summary = entry.get('summary')
+        if 0 <= index < count and isinstance(summary, str) and summary.strip():
+            summaries[index] = summary.strip()
+    return summaries
+
 
-        if response.status_code == 200:
-            summary = response.output.choices[0].message.content
-            return summary.strip()
+def generate_summaries_combined(items, model: str = 'qwen-turbo',
+                                use_cache: bool = True, config: LLMConfig = None) -> list:
+    """
+    Generate summaries for several short articles with one request per group.
+
+    Up to COMBINED_BATCH_SIZE articles are sent in a single request (each
+    cut to COMBINED_ITEM_CHARS characters), which saves the per-request
+    round trip and prompt overhead. Articles the model's answer does not
+    cover, or whose group request fails, fall back to individual calls
+    through generate_summaries_batch().
+
+    A summary already cached by generate_summary() is reused. Summaries
+    from a combined request are cached under their own key (see
+    _combined_cache_key), so generate_summary() never returns these
+    shorter-excerpt results.
+
+    Args:
+        items: Iterable of (title, content) tuples
+        model: Model to use
+        use_cache: Read and write the local summary cache
+        config: Optional LLMConfig supplying the API key and model
+
+    Returns:
+        List of results in input order. Each entry is the summary text,
+        or the RuntimeError raised for that article.
+    """
+    if config is not None:
+        model = config.model
+    items = list(items)
+    results = [None] * len(items)
+    combined_keys = [_combined_cache_key(model, title, content) for title, content in items]
+
+    pending = []
+    for i, (title, content) in enumerate(items):
+        cached = None
+        if use_cache:
+            cached = _cache_get(_cache_key(model, _build_messages(content, title, model)))
+            if cached is None:
+                cached = _cache_get(combined_keys[i])
+        if cached is not None:
+            results[i] = cached
         else:
-            raise RuntimeError(
-                f"API call failed: {response.code} - {response.message}"
+            pending.append(i)
+
+    fallback = []
+    for start in range(0, len(pending), COMBINED_BATCH_SIZE):
+        group = pending[start:start + COMBINED_BATCH_SIZE]
+        if len(group) == 1:
+            fallback.extend(group)
+            continue
+        try:
+            response = _call_with_retry(
+                _require_api_key(config), model,
+                _build_combined_messages([items[i] for i in group]),
             )
-    except Exception as e:
-        if 'response' in dir() and hasattr(response, 'code'):
-            raise RuntimeError(f"API error: {response.code} - {response.message}")
-        raise RuntimeError(f"Failed to generate summary: {e}")
+            text = _extract_summary(response)
+        except Exception:
+            fallback.extend(group)
+            continue
+        summaries = _parse_combined_summaries(text, len(group))
+        for position, i in enumerate(group):
+            if position in summaries:
+                results[i] = summaries[position]
+                if use_cache:
+                    _cache_put(combined_keys[i], results[i])
+            else:
+                fallback.append(i)
+
+    if fallback:
+        retried = asyncio.run(_agenerate_batch(
+            [items[i] for i in fallback], model, DEFAULT_MAX_CONCURRENCY, use_cache, config,
+        ))
+        for i, result in zip(fallback, retried):
+            results[i] = result
+    return results
+
+
+def _read_article(file_path: Path):
+    """
+    Read an article file, returning (title, content).
+
+    Only the leading bytes that can contribute to the prompt are read
+    (UTF-8 needs at most 4 bytes per character), so large files are not
+    decoded in full just to be truncated.
+    """
+    max_bytes = MAX_SCAN_CHARS * 4
+    with file_path.open('rb') as f:
+        raw = f.read(max_bytes + 1)
+    # An incremental decoder holds back a character split at the cut
+    # instead of failing on it, but still rejects invalid UTF-8
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    content = decoder.decode(raw[:max_bytes], final=len(raw) <= max_bytes)
+    content = content[:MAX_SCAN_CHARS]
+    # Extract title from filename
+    title = file_path.stem.translate(_TITLE_TRANS)
+    return title, content
 
 
 def main():
     """CLI entry point."""
     if len(sys.argv) < 2:
-        print("Usage: python summary_generator.py <file_path>")
+        print("Usage: python summary_generator.py <file_path> [<file_path> ...]")
         print("Example: python summary_generator.py ../test/sample_article.md")
         sys.exit(1)
 
-    file_path = Path(sys.argv[1])
+    # Warm up the API connection while the files are read
+    prewarm_connection()
 
-    if not file_path.exists():
-        print(f"Error: File not found: {file_path}")
-        sys.exit(1)
+    file_paths = [Path(arg) for arg in sys.argv[1:]]
+
+    for file_path in file_paths:
+        if not file_path.exists():
+            print(f"Error: File not found: {file_path}")
+            sys.exit(1)
 
     # Read the file content
     try:
-        content = file_path.read_text(encoding='utf-8')
+        articles = [_read_article(file_path) for file_path in file_paths]
     except Exception as e:
         print(f"Error reading file: {e}")
         sys.exit(1)
 
-    # Extract title from filename
-    title = file_path.stem.replace('-', ' ').replace('_', ' ')
+    # Resolve the API key once for all requests
+    config = LLMConfig.from_env()
+
+    if len(articles) > 1:
+        print(f"Generating summaries for {len(articles)} files...")
+        results = generate_summaries_batch(articles, config=config)
+        failed = False
+        for file_path, result in zip(file_paths, results):
+            print("-" * 40)
+            print(f"{file_path.name}:")
+            if isinstance(result, Exception):
+                print(f"Error: {result}")
+                failed = True
+            else:
+                print(result)
+        print("-" * 40)
+        if failed:
+            sys.exit(1)
+        return
+
+    file_path = file_paths[0]
+    title, content = articles[0]
 
     print(f"Generating summary for: {file_path.name}")
     print("-" * 40)
 
     try:
-        summary = generate_summary(content, title)
         print("Summary:")
-        print(summary)
+        summary = generate_summary(
+            content, title,
+            on_chunk=lambda text: print(text, end='', flush=True),
+            config=config,
+        )
+        print()
         print("-" * 40)
         print(f"Length: {len(summary)} characters")
     except RuntimeError as e:
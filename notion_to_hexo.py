@@ -7,44 +7,19 @@ For new code, prefer importing directly from the package:
     from notion_to_hexo import fetch_notion_page, upload_to_oss
 """
 
-# Re-export everything from the package for backwards compatibility
-from notion_to_hexo import (
-    # Config
-    config,
-    load_config,
-    get_config,
-    TIMEOUT_API,
-    TIMEOUT_IMAGE,
-    MAX_RETRIES,
-    RETRY_BACKOFF,
-    # Exceptions
-    NotionToHexoError,
-    NotionAPIError,
-    OSSUploadError,
-    HexoCommandError,
-    ConfigurationError,
-    # Network
-    request_with_retry,
-    # Hexo
-    run_hexo_command,
-    sanitize_filename,
-    find_hexo_executable,
-    # Notion
-    fetch_notion_page,
-    extract_notion_page_id,
-    # Converter
-    blocks_to_markdown,
-    rich_text_to_markdown,
-    # OSS
-    upload_to_oss,
-    download_notion_image,
-    process_images_in_markdown,
-    # CLI
-    main,
-    create_hexo_post,
-    test_mode_export,
-    print_step,
-)
+import notion_to_hexo as _package
+from notion_to_hexo import config
+
+
+def __getattr__(name):
+    # Re-export the package lazily (PEP 562), so only the names actually
+    # used pull in their dependencies
+    try:
+        value = getattr(_package, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
 
 # Backwards compatibility: expose config attributes as module-level globals
 HEXO_ROOT = config.hexo_root
@@ -67,4 +42,4 @@ from pathlib import Path
 DEFAULT_BLOG_PATH = Path.home() / 'Documents' / 'Blog'
 
 if __name__ == '__main__':
-    main()
+    _package.main()
@@ -8,6 +8,8 @@ Usage:
     from notion_to_hexo import fetch_notion_page, upload_to_oss, create_hexo_post
 """
 
+import importlib
+
 from .config import (
     config,
     load_config,
@@ -26,36 +28,50 @@ from .exceptions import (
     ConfigurationError,
 )
 
-from .network import request_with_retry
+# The remaining submodules pull in requests, oss2, yaml and friends, so
+# they are imported on first attribute access (PEP 562). config and
+# exceptions are cheap and stay eager; importing the config submodule
+# lazily would also shadow the `config` object with the module.
+_LAZY_IMPORTS = {
+    # Network
+    'request_with_retry': '.network',
+    # Hexo
+    'run_hexo_command': '.hexo',
+    'sanitize_filename': '.hexo',
+    'find_hexo_executable': '.hexo',
+    'hexo_command_prefix': '.hexo',
+    # Notion
+    'fetch_notion_page': '.notion',
+    'extract_notion_page_id': '.notion',
+    # Converter
+    'blocks_to_markdown': '.converter',
+    'rich_text_to_markdown': '.converter',
+    # OSS
+    'upload_to_oss': '.oss',
+    'upload_bytes_to_oss': '.oss',
+    'fetch_notion_image': '.oss',
+    'download_notion_image': '.oss',
+    'process_images_in_markdown': '.oss',
+    # CLI
+    'main': '.cli',
+    'create_hexo_post': '.cli',
+    'test_mode_export': '.cli',
+    'print_step': '.cli',
+}
 
-from .hexo import (
-    run_hexo_command,
-    sanitize_filename,
-    find_hexo_executable,
-)
 
-from .notion import (
-    fetch_notion_page,
-    extract_notion_page_id,
-)
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
-from .converter import (
-    blocks_to_markdown,
-    rich_text_to_markdown,
-)
 
-from .oss import (
-    upload_to_oss,
-    download_notion_image,
-    process_images_in_markdown,
-)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-from .cli import (
-    main,
-    create_hexo_post,
-    test_mode_export,
-    print_step,
-)
 
 __all__ = [
     # Config
@@ -78,6 +94,7 @@ __all__ = [
     'run_hexo_command',
     'sanitize_filename',
     'find_hexo_executable',
+    'hexo_command_prefix',
     # Notion
     'fetch_notion_page',
     'extract_notion_page_id',
@@ -86,6 +103,8 @@ __all__ = [
     'rich_text_to_markdown',
     # OSS
     'upload_to_oss',
+    'upload_bytes_to_oss',
+    'fetch_notion_image',
     'download_notion_image',
     'process_images_in_markdown',
     # CLI
@@ -16,7 +16,7 @@ from datetime import datetime
 
 import streamlit as st
 
-from notion_to_hexo.config import config, load_config
+from notion_to_hexo.config import config, load_config, read_config_file
 from notion_to_hexo.hexo import sanitize_filename, run_hexo_command
 from notion_to_hexo.notion import fetch_notion_page, extract_notion_page_id
 from notion_to_hexo.oss import process_images_in_markdown
@@ -33,12 +33,14 @@ def _save_config_to_file(cfg_dict):
 
 
 def _load_config_dict():
-    """Load raw config dict from config.json."""
-    config_path = config.get_config_path()
-    if config_path.exists():
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    """
+    Load raw config dict from config.json.
+
+    Streamlit reruns this on every interaction, so the parse is shared
+    with load_config() and skipped while the file is unchanged. The
+    returned dict must not be modified.
+    """
+    return read_config_file()
 
 
 def sidebar_config():
@@ -151,6 +153,8 @@ def main_ui():
     # Input section
     st.subheader("1. 输入 Notion 页面")
     notion_url = st.text_input("Notion URL", placeholder="https://www.notion.so/...")
+    refresh = st.checkbox("忽略缓存", value=False,
+                          help="重新获取全部内容块并重新生成摘要，而不使用本地缓存")
 
     if st.button("获取页面", type="primary"):
         if not notion_url:
@@ -169,7 +173,7 @@ def main_ui():
         with st.status("正在获取页面内容...", expanded=True) as status:
             try:
                 st.write("正在连接 Notion API...")
-                title, content, tags, category, description, mathjax = fetch_notion_page(page_id)
+                title, content, tags, category, description, mathjax = fetch_notion_page(page_id, refresh=refresh)
                 st.session_state.page_data = {
                     'title': title,
                     'content': content,
@@ -211,7 +215,8 @@ def main_ui():
         with col4:
             if st.button("LLM 生成摘要"):
                 with st.spinner("正在生成摘要..."):
-                    summary = generate_summary_with_llm(data['content'], front_title or title)
+                    summary = generate_summary_with_llm(data['content'], front_title or title,
+                                                        refresh=refresh)
                     if summary:
                         description = summary
                         st.success("摘要生成成功!")
@@ -234,9 +239,11 @@ def main_ui():
         }
         if description:
             front_matter['description'] = description
+        # Serialized once per rerun; shared by the preview and the download
+        front_matter_text = _build_front_matter(front_matter)
 
         with st.expander("查看 Front Matter", expanded=True):
-            st.code(_build_front_matter(front_matter), language='yaml')
+            st.code(front_matter_text, language='yaml')
 
         # Actions
         st.subheader("4. 操作")
@@ -272,7 +279,7 @@ def main_ui():
                             description, mathjax, front_title or title
                         )
                         st.write("生成静态文件...")
-                        run_hexo_command("hexo generate")
+                        run_hexo_command(['hexo', 'generate'])
                         status.update(label="发布成功!", state="complete")
                         st.success(f"文章已发布: {post_file}")
                     except Exception as e:
@@ -281,7 +288,7 @@ def main_ui():
 
         with col_c:
             # Download button
-            md_content = _build_front_matter(front_matter) + data['content']
+            md_content = front_matter_text + data['content']
             safe_title = sanitize_filename(title)
             st.download_button(
                 "下载 Markdown",
@@ -0,0 +1,76 @@
+"""
+Local cache for Notion to Hexo.
+
+A small SQLite key-value store under ~/.cache/notion_to_hexo, used to skip
+work that was already done in an earlier run (converted page content,
+uploaded images, LLM summaries). Cache failures are logged and otherwise ignored; they
+never stop a publish.
+"""
+
+import time
+import sqlite3
+import logging
+import contextlib
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path.home() / '.cache' / 'notion_to_hexo' / 'cache.db'
+
+
+def _connect():
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=10)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS entries ('
+        'namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+        'created_at REAL NOT NULL, PRIMARY KEY (namespace, key))'
+    )
+    return conn
+
+
+def cache_get(namespace, key, max_age=None):
+    """
+    Look up a cached value.
+
+    Args:
+        namespace: Cache section, e.g. 'pages'
+        key: Entry key within the namespace
+        max_age: Optional maximum entry age in seconds
+
+    Returns:
+        The cached string, or None if missing, expired or unreadable
+    """
+    query = 'SELECT value FROM entries WHERE namespace = ? AND key = ?'
+    params = [namespace, key]
+    if max_age is not None:
+        query += ' AND created_at > ?'
+        params.append(time.time() - max_age)
+
+    try:
+        with contextlib.closing(_connect()) as conn:
+            row = conn.execute(query, params).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        logger.debug("读取缓存失败: %s", e)
+        return None
+    return row[0] if row else None
+
+
+def cache_put(namespace, key, value):
+    """
+    Store a value, replacing any existing entry.
+
+    Args:
+        namespace: Cache section, e.g. 'pages'
+        key: Entry key within the namespace
+        value: String to store
+    """
+    try:
+        with contextlib.closing(_connect()) as conn, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (namespace, key, value, created_at) '
+                'VALUES (?, ?, ?, ?)',
+                (namespace, key, value, time.time()),
+            )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("写入缓存失败: %s", e)
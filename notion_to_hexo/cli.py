@@ -4,19 +4,29 @@ Command-line interface and main workflow for Notion to Hexo.
 Provides the main entry point and workflow orchestration.
 """
 
+import os
+import re
 import sys
+import hashlib
 import time
 import shutil
+import socket
+import getpass
 import logging
+import tempfile
+import threading
 import argparse
 import subprocess
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
 
-import yaml
-
-from .config import config, get_config, load_config
-from .hexo import run_hexo_command, sanitize_filename, find_hexo_executable
+from .config import (
+    config, get_config, load_config, TIMEOUT_LLM, MAX_RETRIES, RETRY_BACKOFF,
+)
+from .hexo import run_hexo_command, sanitize_filename, hexo_command_prefix
+from .cache import cache_get, cache_put
+from .network import json_loads
 from .notion import fetch_notion_page, extract_notion_page_id
 from .oss import process_images_in_markdown
 from .exceptions import (
@@ -38,7 +48,8 @@ def _build_front_matter(front_matter):
     Build YAML front matter string.
 
     Uses PyYAML to properly escape special characters in titles
-    and other fields, preventing invalid YAML output.
+    and other fields, preventing invalid YAML output. PyYAML is imported
+    here rather than with the module, so --help and --ui do not load it.
 
     Args:
         front_matter: Dictionary of front matter fields
@@ -46,8 +57,13 @@ def _build_front_matter(front_matter):
     Returns:
         Complete front matter string with --- delimiters
     """
+    import yaml
+
     content = yaml.dump(
         front_matter,
+        # Not CSafeDumper: libyaml escapes characters outside the BMP
+        # (e.g. emoji) even with allow_unicode
+        Dumper=yaml.SafeDumper,
         default_flow_style=False,
         allow_unicode=True,
         sort_keys=False,
@@ -55,17 +71,103 @@ def _build_front_matter(front_matter):
     return f"---\n{content}---\n\n"
 
 
-def generate_summary_with_llm(content, front_title):
+def _write_post(path, front_matter, content):
     """
-    Generate article summary using Aliyun DashScope API.
+    Write front matter and content to a Markdown file.
+
+    The document is encoded once and written to a temporary file that is
+    synced to disk and then replaces the target, so Hexo never sees a
+    half-written post, even after a crash.
 
     Args:
-        content: Full article content (markdown)
-        front_title: Article display title
+        path: Target file path
+        front_matter: Dictionary of front matter fields
+        content: Markdown body
+    """
+    payload = (_build_front_matter(front_matter) + content).encode('utf-8')
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+# Upper bound on response length; a 150-250 character summary (plus tags
+# and category) fits well within it
+SUMMARY_MAX_TOKENS = 512
+
+LLM_MODEL = 'qwen-turbo'
+
+# Cached LLM results are reused for this long; --refresh bypasses them
+LLM_CACHE_TTL = 30 * 86400  # seconds
+
+_SUMMARY_REQUIREMENTS = """摘要应该：
+1. 概括文章的主要内容和核心观点
+2. 吸引读者继续阅读
+3. 使用与文章相同的语言（中文文章用中文，英文文章用英文）
+4. 避免使用数学符号或特殊字符"""
+
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def _stream_llm(Generation, on_chunk, **kwargs):
+    """
+    Make a streaming Generation.call, passing each text delta to on_chunk.
 
     Returns:
-        Generated summary string, or None if generation fails
+        (response, text): the last response chunk (a non-200 one if the
+        stream failed) and the text received so far
+    """
+    parts = []
+    response = None
+    for response in Generation.call(stream=True, incremental_output=True, **kwargs):
+        if response.status_code != 200:
+            break
+        delta = response.output.choices[0].message.content
+        if delta:
+            parts.append(delta)
+            on_chunk(delta)
+    if response is None:
+        raise RuntimeError("empty response stream")
+    return response, ''.join(parts)
+
+
+def _call_llm(system_prompt, user_prompt, on_chunk=None, validate=None, refresh=False):
     """
+    Send one prompt to DashScope, retrying throttling and server errors.
+
+    Successful responses are cached by prompt for LLM_CACHE_TTL, so running
+    again on an unchanged article does not call the API.
+
+    Args:
+        system_prompt: System message
+        user_prompt: User message
+        on_chunk: Optional callable receiving text deltas as they arrive.
+                  Once any text has been passed on, the call is no
+                  longer retried.
+        validate: Optional callable taking the response text; responses
+                  it rejects are returned but not cached
+        refresh: Ignore a cached response and call the API again (the
+                 result still updates the cache)
+
+    Returns:
+        Response text, or None if the call fails
+    """
+    cache_key = hashlib.blake2b(
+        f"{LLM_MODEL}\0{system_prompt}\0{user_prompt}".encode('utf-8')
+    ).hexdigest()
+    cached = None if refresh else cache_get('summaries', cache_key, max_age=LLM_CACHE_TTL)
+    if cached is not None:
+        logger.info("使用缓存的 LLM 结果")
+        if on_chunk is not None:
+            on_chunk(cached)
+        return cached
+
     try:
         from dashscope import Generation
     except ImportError:
@@ -77,43 +179,165 @@ def generate_summary_with_llm(content, front_title):
         logger.warning("DASHSCOPE_API_KEY 未配置")
         return None
 
+    call_kwargs = dict(
+        api_key=api_key,
+        model=LLM_MODEL,
+        messages=[
+            {'role': 'system', 'content': system_prompt},
+            {'role': 'user', 'content': user_prompt}
+        ],
+        result_format='message',
+        max_tokens=SUMMARY_MAX_TOKENS,
+        request_timeout=TIMEOUT_LLM,
+    )
+
+    print("正在调用 LLM API 生成摘要...")
+    for attempt in range(MAX_RETRIES):
+        text = ''
+        try:
+            if on_chunk is None:
+                response = Generation.call(**call_kwargs)
+                text = response.output.choices[0].message.content if response.status_code == 200 else ''
+            else:
+                response, text = _stream_llm(Generation, on_chunk, **call_kwargs)
+        except Exception as e:
+            error = e
+        else:
+            if response.status_code == 200:
+                text = text.strip()
+                if text and (validate is None or validate(text)):
+                    cache_put('summaries', cache_key, text)
+                return text
+            # Only throttling and server errors are worth retrying
+            if response.status_code != 429 and response.status_code < 500:
+                logger.error("API 调用失败: %s - %s", response.code, response.message)
+                return None
+            error = f"{response.code} - {response.message}"
+
+        # Text already shown to the user cannot be taken back
+        if text:
+            break
+        if attempt < MAX_RETRIES - 1:
+            wait_time = RETRY_BACKOFF ** attempt
+            logger.warning("生成摘要失败 (尝试 %d/%d): %s, %d秒后重试...",
+                           attempt + 1, MAX_RETRIES, error, wait_time)
+            time.sleep(wait_time)
+
+    logger.error("生成摘要时出错: %s", error)
+    return None
+
+
+def generate_summary_with_llm(content, front_title, stream=False, refresh=False):
+    """
+    Generate article summary using Aliyun DashScope API.
+
+    Args:
+        content: Full article content (markdown)
+        front_title: Article display title
+        stream: Print the summary as it is generated, prefixed with
+                "生成的摘要: "
+        refresh: Generate a new summary instead of reusing a cached one
+
+    Returns:
+        Generated summary string, or None if generation fails
+    """
     title_context = f"标题：{front_title}\n\n" if front_title else ""
     user_prompt = f"""请为以下文章生成一段简洁的摘要（150-250字），用于博客文章的description字段。
-摘要应该：
-1. 概括文章的主要内容和核心观点
-2. 吸引读者继续阅读
-3. 使用与文章相同的语言（中文文章用中文，英文文章用英文）
-4. 避免使用数学符号或特殊字符
+{_SUMMARY_REQUIREMENTS}
 
 {title_context}内容：
 {content[:4000]}"""
 
     system_prompt = "你是一个专业的内容编辑，擅长为博客文章撰写吸引人的摘要。请直接输出摘要内容，不需要任何前缀或解释。"
 
+    if not stream:
+        return _call_llm(system_prompt, user_prompt, refresh=refresh)
+
+    started = False
+
+    def print_chunk(delta):
+        nonlocal started
+        if not started:
+            print("生成的摘要: ", end='')
+            started = True
+        print(delta, end='', flush=True)
+
+    summary = _call_llm(system_prompt, user_prompt, on_chunk=print_chunk, refresh=refresh)
+    if started:
+        print()
+    return summary
+
+
+def _parse_metadata(text):
+    """
+    Parse the JSON object returned for a metadata request.
+
+    Returns:
+        Dict with 'summary', 'tags' and 'category', or None if the text
+        has no usable summary
+    """
+    # Models sometimes wrap the JSON in a code fence or a sentence
+    match = _JSON_OBJECT_RE.search(text)
     try:
-        print("正在调用 LLM API 生成摘要...")
-        response = Generation.call(
-            api_key=api_key,
-            model='qwen-turbo',
-            messages=[
-                {'role': 'system', 'content': system_prompt},
-                {'role': 'user', 'content': user_prompt}
-            ],
-            result_format='message'
-        )
-
-        if response.status_code == 200:
-            summary = response.output.choices[0].message.content
-            return summary.strip()
-        else:
-            logger.error("API 调用失败: %s - %s", response.code, response.message)
-            return None
-    except Exception as e:
-        logger.error("生成摘要时出错: %s", e)
+        data = json_loads(match.group(0) if match else text)
+    except ValueError:
         return None
 
+    summary = data.get('summary') if isinstance(data, dict) else None
+    if not isinstance(summary, str) or not summary.strip():
+        return None
+    tags = data.get('tags')
+    category = data.get('category')
+    return {
+        'summary': summary.strip(),
+        'tags': [str(t).strip() for t in tags if str(t).strip()] if isinstance(tags, list) else [],
+        'category': category.strip() if isinstance(category, str) else '',
+    }
 
-def create_hexo_post(title, content, tags, category, description, mathjax, front_title=None):
+
+def generate_metadata_with_llm(content, front_title, refresh=False):
+    """
+    Generate summary, tags and category in a single DashScope request.
+
+    Used when tags or category are missing as well as the summary, so one
+    request covers all three instead of one per field.
+
+    Args:
+        content: Full article content (markdown)
+        front_title: Article display title
+        refresh: Generate new metadata instead of reusing cached metadata
+
+    Returns:
+        Dict with 'summary' (str), 'tags' (list of str) and 'category'
+        (str), or None if generation or parsing fails
+    """
+    title_context = f"标题：{front_title}\n\n" if front_title else ""
+    user_prompt = f"""请为以下文章生成博客元数据，以 JSON 对象输出，包含以下字段：
+- summary: 一段简洁的摘要（150-250字），用于博客文章的description字段
+- tags: 3-5 个标签组成的字符串数组
+- category: 一个分类名称
+
+{_SUMMARY_REQUIREMENTS}
+
+{title_context}内容：
+{content[:4000]}"""
+
+    system_prompt = "你是一个专业的内容编辑，擅长为博客文章撰写摘要和标签。请严格按照要求的 JSON 格式输出，不需要任何前缀或解释。"
+
+    # Only parseable metadata is cached, so a bad reply is retried next run
+    text = _call_llm(system_prompt, user_prompt, refresh=refresh,
+                     validate=lambda reply: _parse_metadata(reply) is not None)
+    if not text:
+        return None
+
+    metadata = _parse_metadata(text)
+    if metadata is None:
+        logger.warning("无法解析 LLM 返回的元数据: %s", text[:200])
+    return metadata
+
+
+def create_hexo_post(title, content, tags, category, description, mathjax, front_title=None,
+                     summary_future=None):
     """
     Create a Hexo blog post.
 
@@ -125,6 +349,10 @@ def create_hexo_post(title, content, tags, category, description, mathjax, front
         description: Article description
         mathjax: Whether to enable mathjax
         front_title: Display title for front matter (defaults to title)
+        summary_future: Optional Future resolving to an LLM-generated summary.
+                        It is waited on after image processing, so summary
+                        generation overlaps the image uploads. A non-empty
+                        result replaces description.
 
     Returns:
         Path to the created post file
@@ -156,20 +384,18 @@ def create_hexo_post(title, content, tags, category, description, mathjax, front
 
     # Process images
     print_step(2, "处理图片并上传到OSS")
-    temp_dir = config.hexo_root / 'temp_images'
-    temp_dir.mkdir(exist_ok=True)
+    processed_content = process_images_in_markdown(content)
 
-    try:
-        processed_content = process_images_in_markdown(content, temp_dir)
-    finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+    if summary_future is not None:
+        generated = summary_future.result()
+        if generated:
+            front_matter['description'] = generated
+            print(f"生成的摘要: {generated}")
 
     # Write file
     print_step(3, "写入Markdown文件")
 
-    with open(post_file, 'w', encoding='utf-8') as f:
-        f.write(_build_front_matter(front_matter))
-        f.write(processed_content)
+    _write_post(post_file, front_matter, processed_content)
 
     print(f"文章已创建: {post_file}")
     return post_file
@@ -208,14 +434,100 @@ def test_mode_export(title, content, tags, category, description, mathjax, front
     safe_title = sanitize_filename(title)
     test_file = test_dir / f'{safe_title}.md'
 
-    with open(test_file, 'w', encoding='utf-8') as f:
-        f.write(_build_front_matter(front_matter))
-        f.write(content)
+    _write_post(test_file, front_matter, content)
 
     print(f"测试文件已创建: {test_file}")
     return test_file
 
 
+DEFAULT_CDN_DOMAIN = 'phoenizard-picgo.oss-cn-hangzhou.aliyuncs.com'
+
+_OSS_PROMPTS = (
+    ('access_key_id', "Access Key ID: "),
+    ('access_key_secret', "Access Key Secret: "),
+    ('bucket_name', "Bucket名称: "),
+    ('endpoint', "Endpoint (如: oss-cn-hangzhou.aliyuncs.com): "),
+    ('cdn_domain', f"CDN域名 (留空使用默认: {DEFAULT_CDN_DOMAIN}): "),
+)
+
+
+def _prompt_oss_config(oss_cfg):
+    """
+    Interactively fill in missing OSS settings.
+
+    Values already set by config.json or environment variables (see
+    config.ENV_VARS) are kept and not asked for again. The secret is read
+    without echo.
+
+    Args:
+        oss_cfg: OSS config dict, updated in place
+    """
+    print("\n配置阿里云OSS")
+    print("(已在 config.json 或环境变量中配置的项将跳过)")
+
+    for key, message in _OSS_PROMPTS:
+        if oss_cfg.get(key):
+            continue
+        read = getpass.getpass if key == 'access_key_secret' else input
+        oss_cfg[key] = read(message).strip()
+
+    if not oss_cfg['cdn_domain']:
+        oss_cfg['cdn_domain'] = DEFAULT_CDN_DOMAIN
+        print(f"使用默认CDN域名: {oss_cfg['cdn_domain']}")
+
+
+def _run_in_background(fn, *args, **kwargs):
+    """
+    Run fn on a daemon thread and return a Future for its result.
+
+    Unlike a ThreadPoolExecutor worker, the thread does not keep the
+    interpreter alive, so a result that is never collected (the run fails
+    or is interrupted first) does not delay exit.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def _wait_for_server(process, port=4000, timeout=10):
+    """
+    Wait until a local server accepts connections on port.
+
+    Polls with a short, growing interval instead of sleeping for a fixed
+    time, so a fast start is noticed within milliseconds.
+
+    Args:
+        process: Popen object of the server
+        port: Port the server listens on
+        timeout: Maximum seconds to wait
+
+    Returns:
+        False if the process exited, True otherwise (including a slow
+        server that is still starting when the timeout expires)
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(('localhost', port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+    return process.poll() is None
+
+
 def _prompt(message, default='', yes_mode=False):
     """
     Prompt user for input, respecting --yes mode.
@@ -271,6 +583,10 @@ def build_parser():
                         help='自动部署到远程')
     parser.add_argument('--llm-summary', action='store_true',
                         help='使用 LLM 自动生成文章摘要')
+    parser.add_argument('--stream-summary', action='store_true',
+                        help='逐字输出 LLM 生成的摘要（仅用于需等待摘要的交互流程）')
+    parser.add_argument('--refresh', action='store_true',
+                        help='忽略本地缓存，重新获取 Notion 页面内容并重新生成 LLM 摘要')
 
     # Configuration
     parser.add_argument('--config', dest='config_path',
@@ -369,31 +685,21 @@ def main(argv=None):
     if not config.notion_token:
         if yes_mode:
             raise ConfigurationError("NOTION_TOKEN 未配置")
-        config.notion_token = input("\n请输入Notion Integration Token: ").strip()
+        config.notion_token = getpass.getpass("\n请输入Notion Integration Token: ").strip()
+
+    needs_oss = not test_mode and not dry_run
+    if needs_oss and not config.oss_config['access_key_id'] and yes_mode:
+        raise ConfigurationError("OSS 凭证未配置，--yes 模式下无法交互输入")
+
+    # Start fetching the page now so the download overlaps the OSS prompts
+    # below; the result is collected in step 0. If the run stops before
+    # then, the fetch is abandoned rather than waited for at exit.
+    page_future = _run_in_background(fetch_notion_page, page_id, refresh=args.refresh)
 
     # Configure OSS (skip in test/dry-run mode)
-    if not test_mode and not dry_run:
+    if needs_oss:
         if not config.oss_config['access_key_id']:
-            if yes_mode:
-                raise ConfigurationError("OSS 凭证未配置，--yes 模式下无法交互输入")
-            print("\n配置阿里云OSS")
-            print("(留空则从PicGo配置读取,或跳过此步骤)")
-
-            access_key = input("Access Key ID: ").strip()
-            if access_key:
-                config.oss_config['access_key_id'] = access_key
-                config.oss_config['access_key_secret'] = input("Access Key Secret: ").strip()
-                config.oss_config['bucket_name'] = input("Bucket名称: ").strip()
-                config.oss_config['endpoint'] = input("Endpoint (如: oss-cn-hangzhou.aliyuncs.com): ").strip()
-                config.oss_config['cdn_domain'] = input("CDN域名 (如: your-bucket.oss-cn-hangzhou.aliyuncs.com): ").strip()
-            else:
-                config.oss_config['cdn_domain'] = 'phoenizard-picgo.oss-cn-hangzhou.aliyuncs.com'
-                print(f"使用默认CDN域名: {config.oss_config['cdn_domain']}")
-                print("请手动配置OSS认证信息...")
-                config.oss_config['access_key_id'] = input("Access Key ID: ").strip()
-                config.oss_config['access_key_secret'] = input("Access Key Secret: ").strip()
-                config.oss_config['bucket_name'] = input("Bucket名称: ").strip()
-                config.oss_config['endpoint'] = input("Endpoint: ").strip()
+            _prompt_oss_config(config.oss_config)
         else:
             print("\n已使用配置的阿里云OSS设置")
             print(f"  CDN域名: {config.oss_config['cdn_domain']}")
@@ -407,7 +713,7 @@ def main(argv=None):
         print_step(0, "从Notion获取页面内容")
         print("获取Notion页面内容...")
         try:
-            notion_title, content, notion_tags, notion_category, notion_description, notion_mathjax = fetch_notion_page(page_id)
+            notion_title, content, notion_tags, notion_category, notion_description, notion_mathjax = page_future.result()
         except NotionAPIError as e:
             raise NotionAPIError(f"获取Notion页面失败: {e}") from e
 
@@ -421,6 +727,17 @@ def main(argv=None):
         # Prompt for missing values
         if not title:
             title = _prompt("请输入文章标题: ", "无标题文章", yes_mode)
+
+        # With --llm-summary, missing tags/category are suggested by the same
+        # request that writes the summary instead of being prompted for
+        llm_metadata = None
+        if args.llm_summary and (not tags or not category):
+            llm_metadata = generate_metadata_with_llm(content, args.front_title or title,
+                                                      refresh=args.refresh)
+            if llm_metadata:
+                tags = tags or llm_metadata['tags']
+                category = category or llm_metadata['category']
+
         if not category:
             category = _prompt("请输入文章分类: ", "学习笔记", yes_mode)
         if not tags and not yes_mode:
@@ -446,18 +763,29 @@ def main(argv=None):
             print(f"前端标题: {front_title}")
 
         # Summary generation
-        if args.llm_summary:
-            generated = generate_summary_with_llm(content, front_title)
+        background_summary = False
+        if llm_metadata:
+            description = llm_metadata['summary']
+            print(f"生成的摘要: {description}")
+        elif args.llm_summary and not test_mode and not dry_run:
+            # Started once the post is confirmed, see below
+            background_summary = True
+        elif args.llm_summary:
+            generated = generate_summary_with_llm(content, front_title, stream=args.stream_summary,
+                                               refresh=args.refresh)
             if generated:
                 description = generated
-                print(f"生成的摘要: {description}")
+                if not args.stream_summary:
+                    print(f"生成的摘要: {description}")
         elif not yes_mode:
             generate_summary = input("\n是否需要生成摘要? (y/n): ").strip().lower()
             if generate_summary == 'y':
-                generated = generate_summary_with_llm(content, front_title)
+                generated = generate_summary_with_llm(content, front_title, stream=args.stream_summary,
+                                                      refresh=args.refresh)
                 if generated:
                     description = generated
-                    print(f"生成的摘要: {description}")
+                    if not args.stream_summary:
+                        print(f"生成的摘要: {description}")
                 else:
                     desc_input = input("请手动输入文章摘要 (留空则使用前端标题): ").strip()
                     description = desc_input if desc_input else front_title
@@ -465,7 +793,9 @@ def main(argv=None):
                 desc_input = input("请输入文章摘要 (留空则使用前端标题): ").strip()
                 description = desc_input if desc_input else front_title
 
-        if description:
+        if background_summary:
+            print("摘要: 将在上传图片时由 LLM 生成")
+        elif description:
             print(f"摘要: {description}")
 
         # Dry-run mode: show preview and exit
@@ -526,53 +856,65 @@ def main(argv=None):
             print(f"测试文件: {test_file}")
             print(f"\n注意: 测试模式下图片URL保持原始Notion链接,未上传到OSS")
         else:
-            # Create Hexo post
-            post_file = create_hexo_post(title, content, tags, category, description, mathjax, front_title)
+            # Generate the summary in the background; create_hexo_post
+            # collects the result after uploading images so the two overlap.
+            # Submitted only now so declining a prompt above costs no API call.
+            summary_future = None
+            if background_summary:
+                summary_executor = ThreadPoolExecutor(max_workers=1)
+                summary_future = summary_executor.submit(generate_summary_with_llm, content, front_title,
+                                                         refresh=args.refresh)
+                summary_executor.shutdown(wait=False)
 
-            # Generate static files
-            print_step(4, "生成Hexo静态文件")
-            success, _ = run_hexo_command("hexo generate")
-
-            if not success:
-                print("警告: 生成静态文件时出现错误")
+            # Create Hexo post
+            post_file = create_hexo_post(title, content, tags, category, description, mathjax, front_title,
+                                         summary_future=summary_future)
 
             if args.no_serve:
-                print(f"\n文章文件: {post_file}")
                 if args.deploy:
-                    print_step(5, "部署到远程")
-                    deploy_success, _ = run_hexo_command("hexo deploy")
+                    # A single hexo process generates and deploys, so the
+                    # site is loaded once instead of twice
+                    print_step(4, "生成静态文件并部署到远程")
+                    deploy_success, _ = run_hexo_command(['hexo', 'deploy', '--generate'], stream=True)
+                    print(f"\n文章文件: {post_file}")
                     if deploy_success:
                         print("\n部署完成!")
                     else:
                         print("警告: 部署时出现错误")
+                    return
+
+                # Generate static files
+                print_step(4, "生成Hexo静态文件")
+                success, _ = run_hexo_command(['hexo', 'generate'], stream=True)
+
+                if not success:
+                    print("警告: 生成静态文件时出现错误")
+
+                print(f"\n文章文件: {post_file}")
                 return
 
-            # Start local preview server
-            print_step(5, "启动本地预览服务器")
+            # Start local preview server. hexo serve renders pages on
+            # request, so static files are only generated when deploying.
+            print_step(4, "启动本地预览服务器")
             print("正在启动 hexo serve...")
 
-            hexo_path = find_hexo_executable()
-            if hexo_path:
-                serve_cmd = [hexo_path, 'serve']
-            else:
-                npx_path = shutil.which('npx')
-                if npx_path:
-                    serve_cmd = [npx_path, 'hexo', 'serve']
-                else:
-                    serve_cmd = ['hexo', 'serve']
+            serve_cmd = [*hexo_command_prefix(), 'serve']
 
+            # stderr goes to a file rather than a pipe: nothing reads it
+            # while the server runs, and a full pipe would block hexo
+            serve_log = tempfile.TemporaryFile()
             serve_process = subprocess.Popen(
                 serve_cmd,
                 cwd=str(config.hexo_root),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stdout=subprocess.DEVNULL,
+                stderr=serve_log,
             )
 
-            time.sleep(3)
-
-            if serve_process.poll() is not None:
-                _, stderr = serve_process.communicate()
-                error_msg = stderr.decode() if stderr else "未知错误"
+            if not _wait_for_server(serve_process):
+                serve_log.seek(0)
+                stderr = serve_log.read()
+                serve_log.close()
+                error_msg = stderr.decode(errors='replace') if stderr else "未知错误"
                 print(f"警告: hexo serve 启动失败: {error_msg}")
             else:
                 print("\n" + "=" * 60)
@@ -591,11 +933,12 @@ def main(argv=None):
                     serve_process.wait(timeout=5)
                 except subprocess.TimeoutExpired:
                     serve_process.kill()
+                serve_log.close()
                 print("预览服务器已停止")
 
                 if deploy_choice:
-                    print_step(6, "部署到远程")
-                    deploy_success, _ = run_hexo_command("hexo deploy")
+                    print_step(5, "生成静态文件并部署到远程")
+                    deploy_success, _ = run_hexo_command(['hexo', 'deploy', '--generate'], stream=True)
                     if deploy_success:
                         print("\n" + "=" * 60)
                         print("部署完成!")
@@ -605,7 +948,7 @@ def main(argv=None):
                 else:
                     print("\n已跳过部署。如需稍后部署,请运行:")
                     print(f"  cd {config.hexo_root}")
-                    print("  hexo deploy")
+                    print("  hexo deploy --generate")
 
     except (NotionAPIError, OSSUploadError, HexoCommandError, ConfigurationError) as e:
         print(f"\n错误: {str(e)}")
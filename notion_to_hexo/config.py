@@ -14,6 +14,7 @@ Use get_config() for lazy loading or load_config() for explicit loading.
 import os
 import json
 import logging
+import functools
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -21,8 +22,16 @@ logger = logging.getLogger(__name__)
 # ==================== Network Configuration ====================
 TIMEOUT_API = 15      # Notion API calls (seconds)
 TIMEOUT_IMAGE = 30    # Image downloads (seconds)
+TIMEOUT_LLM = 30      # LLM summary requests (seconds)
 MAX_RETRIES = 3       # Number of retry attempts
 RETRY_BACKOFF = 2     # Exponential backoff multiplier
+IMAGE_WORKERS = 12    # Concurrent image downloads
+UPLOAD_WORKERS = 8    # Concurrent OSS uploads
+NOTION_WORKERS = 3    # Concurrent Notion API requests
+NOTION_RATE_LIMIT = 3  # Notion API requests per second (the API's average limit)
+MULTIPART_THRESHOLD = 1024 * 1024  # Images above this size use multipart upload
+MULTIPART_PART_SIZE = 512 * 1024   # Multipart part size (bytes)
+MULTIPART_THREADS = 4              # Parts uploaded concurrently per image
 
 # ==================== Environment Variable Names ====================
 ENV_VARS = {
@@ -95,6 +104,43 @@ config = Config()
 _loaded = False
 
 
+@functools.lru_cache(maxsize=4)
+def _read_config_file(path, mtime_ns):
+    """
+    Parse a config.json file.
+
+    Cached on (path, mtime_ns), so reloading an unchanged file skips the
+    read and parse. Callers must not modify the returned dict.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_config_file(config_path=None):
+    """
+    Return the parsed contents of config.json.
+
+    The parse is cached on the file's path and modification time, so
+    repeated calls on an unchanged file skip the read. The returned dict is
+    shared and must not be modified.
+
+    Args:
+        config_path: Optional path to config.json. If None, auto-detect.
+
+    Returns:
+        Config dict, or an empty dict if the file does not exist
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    config_path = Path(config_path) if config_path is not None else config.get_config_path()
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    return _read_config_file(str(config_path), mtime_ns)
+
+
 def load_config(config_path=None):
     """
     Load configuration from config file and environment variables.
@@ -124,15 +170,16 @@ def load_config(config_path=None):
     file_config = {}
 
     # Step 1: Load config.json as base (if exists)
-    if config_path.exists():
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        logger.debug("未找到配置文件: %s", config_path)
+    else:
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                file_config = json.load(f)
+            file_config = _read_config_file(str(config_path), mtime_ns)
             logger.info("已从 %s 加载配置", config_path)
         except json.JSONDecodeError as e:
             logger.warning("config.json 格式错误: %s", e)
-    else:
-        logger.debug("未找到配置文件: %s", config_path)
 
     # Step 2: Apply config.json values (will be overridden by env vars)
     if 'notion' in file_config and file_config['notion'].get('token'):
@@ -152,7 +199,7 @@ def load_config(config_path=None):
             config.hexo_root = Path(hexo['blog_path'])
         config.hexo_config['default_title'] = hexo.get('default_title', '')
         config.hexo_config['default_category'] = hexo.get('default_category', '学习笔记')
-        config.hexo_config['default_tags'] = hexo.get('default_tags', [])
+        config.hexo_config['default_tags'] = list(hexo.get('default_tags', []))
         config.hexo_config['default_description'] = hexo.get('default_description', '')
         config.hexo_config['default_mathjax'] = hexo.get('default_mathjax', False)
 
@@ -224,14 +271,15 @@ def try_load_dotenv():
     """
     Try to load .env file if python-dotenv is available.
 
-    Called by load_config(), not on module import.
+    Called by load_config(), not on module import. python-dotenv is only
+    imported when a .env file is actually present.
     """
+    env_path = Path(__file__).parent.parent / '.env'
+    if not env_path.exists():
+        return
     try:
         from dotenv import load_dotenv
-        package_dir = Path(__file__).parent.parent
-        env_path = package_dir / '.env'
-        if env_path.exists():
-            load_dotenv(env_path)
-            logger.info("已从 %s 加载环境变量", env_path)
     except ImportError:
-        pass
+        return
+    load_dotenv(env_path)
+    logger.info("已从 %s 加载环境变量", env_path)
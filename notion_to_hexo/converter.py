@@ -8,6 +8,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Markdown markers for bold, italic, code and strikethrough, innermost first
+_ANNOTATION_MARKERS = (('bold', '**'), ('italic', '*'), ('code', '`'), ('strikethrough', '~~'))
+
+
+def _build_annotation_wraps():
+    """(prefix, suffix) for every combination of annotations, indexed by bitmask."""
+    wraps = []
+    for mask in range(1 << len(_ANNOTATION_MARKERS)):
+        prefix = suffix = ''
+        for bit, (_, marker) in enumerate(_ANNOTATION_MARKERS):
+            if mask & (1 << bit):
+                prefix = marker + prefix
+                suffix = suffix + marker
+        wraps.append((prefix, suffix))
+    return tuple(wraps)
+
+
+_ANNOTATION_WRAPS = _build_annotation_wraps()
+
 
 def rich_text_to_markdown(rich_text_array):
     """
@@ -34,15 +53,14 @@ def rich_text_to_markdown(rich_text_array):
         annotations = text_obj.get('annotations', {})
         href = text_obj.get('href')
 
-        # Apply formatting
-        if annotations.get('bold'):
-            text = f"**{text}**"
-        if annotations.get('italic'):
-            text = f"*{text}*"
-        if annotations.get('code'):
-            text = f"`{text}`"
-        if annotations.get('strikethrough'):
-            text = f"~~{text}~~"
+        # Apply formatting with a single lookup of the combined markers
+        mask = 0
+        for bit, (name, _) in enumerate(_ANNOTATION_MARKERS):
+            if annotations.get(name):
+                mask |= 1 << bit
+        if mask:
+            prefix, suffix = _ANNOTATION_WRAPS[mask]
+            text = f"{prefix}{text}{suffix}"
 
         # Handle links
         if href:
@@ -68,7 +86,18 @@ def blocks_to_markdown(blocks, fetch_children=None, level=0):
         Markdown formatted string
     """
     markdown = []
+    _render_blocks(blocks, fetch_children, level, markdown)
+    return '\n'.join(markdown)
 
+
+def _render_blocks(blocks, fetch_children, level, markdown):
+    """
+    Append the Markdown lines for blocks to the markdown list.
+
+    Nested blocks are rendered into the same list, so the output is joined
+    once at the top instead of once per nesting level.
+    """
+    indent = '  ' * level
     for block in blocks:
         block_type = block.get('type')
         block_content = block.get(block_type, {})
@@ -95,18 +124,15 @@ def blocks_to_markdown(blocks, fetch_children=None, level=0):
 
         elif block_type == 'bulleted_list_item':
             text = rich_text_to_markdown(block_content.get('rich_text', []))
-            indent = '  ' * level
             markdown.append(f"{indent}- {text}")
 
         elif block_type == 'numbered_list_item':
             text = rich_text_to_markdown(block_content.get('rich_text', []))
-            indent = '  ' * level
             markdown.append(f"{indent}1. {text}")
 
         elif block_type == 'to_do':
             text = rich_text_to_markdown(block_content.get('rich_text', []))
             checked = block_content.get('checked', False)
-            indent = '  ' * level
             checkbox = '[x]' if checked else '[ ]'
             markdown.append(f"{indent}- {checkbox} {text}")
 
@@ -199,13 +225,15 @@ def blocks_to_markdown(blocks, fetch_children=None, level=0):
 
                     markdown.append('')
                 else:
-                    child_markdown = blocks_to_markdown(
-                        children,
-                        fetch_children,
-                        level + 1
-                    )
-                    if child_markdown.strip():
-                        markdown.append(child_markdown)
+                    child_start = len(markdown)
+                    try:
+                        _render_blocks(children, fetch_children, level + 1, markdown)
+                    except Exception:
+                        del markdown[child_start:]
+                        raise
+                    # Drop children that rendered to nothing but blank lines
+                    if not any(line.strip() for line in markdown[child_start:]):
+                        del markdown[child_start:]
 
                     # Close toggle
                     if block_type == 'toggle':
@@ -218,5 +246,3 @@ def blocks_to_markdown(blocks, fetch_children=None, level=0):
             # Close empty toggle
             markdown.append('</details>')
             markdown.append('')
-
-    return '\n'.join(markdown)
@@ -7,6 +7,7 @@ file/filename utilities for blog post creation.
 
 import re
 import glob
+import functools
 import shlex
 import shutil
 import logging
@@ -17,11 +18,26 @@ from .config import config
 
 logger = logging.getLogger(__name__)
 
+# Every character str.isspace() (and so the regex \s) accepts
+_WHITESPACE_CHARS = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)
+# Illegal filename characters and whitespace all become '-', in one
+# str.translate pass
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*' + _WHITESPACE_CHARS, '-'))
+_DASH_RUN_RE = re.compile(r'-+')
 
+
+@functools.lru_cache(maxsize=1)
 def find_hexo_executable():
     """
     Find the hexo executable path.
 
+    The result is cached for the life of the process, since the lookup
+    probes PATH and several install locations on disk.
+
     Returns:
         str: Path to hexo executable, or None if not found
     """
@@ -55,7 +71,49 @@ def find_hexo_executable():
     return None
 
 
-def run_hexo_command(command_args, cwd=None):
+@functools.lru_cache(maxsize=1)
+def hexo_command_prefix():
+    """
+    Return the argument list that invokes hexo, resolved once per process.
+
+    Returns:
+        tuple: (hexo_path,), (npx_path, 'hexo'), or ('hexo',) to rely on PATH
+    """
+    hexo_path = find_hexo_executable()
+    if hexo_path:
+        return (hexo_path,)
+    npx_path = shutil.which('npx')
+    if npx_path:
+        return (npx_path, 'hexo')
+    return ('hexo',)
+
+
+def _run_streaming(command_list, cwd):
+    """
+    Run a command, echoing its output line by line as it is produced.
+
+    stderr is merged into stdout so a single reader sees everything in
+    order without blocking on either pipe.
+
+    Returns:
+        (returncode, output)
+    """
+    lines = []
+    with subprocess.Popen(
+        command_list,
+        cwd=str(cwd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    ) as proc:
+        for line in proc.stdout:
+            print(line, end='', flush=True)
+            lines.append(line)
+    return proc.returncode, ''.join(lines)
+
+
+def run_hexo_command(command_args, cwd=None, stream=False):
     """
     Run Hexo command (secure version, no shell execution).
 
@@ -63,6 +121,8 @@ def run_hexo_command(command_args, cwd=None):
         command_args: Command argument list, e.g., ['hexo', 'new', 'Title']
                       or string form for simple commands like 'hexo generate'
         cwd: Working directory, defaults to config.hexo_root
+        stream: Print output while the command runs, for long commands
+                such as generate and deploy
 
     Returns:
         (success: bool, output: str)
@@ -76,19 +136,20 @@ def run_hexo_command(command_args, cwd=None):
     else:
         command_list = list(command_args)
 
-    # Find hexo executable and replace 'hexo' with full path
+    # Replace 'hexo' with the resolved executable (or npx fallback)
     if command_list and command_list[0] == 'hexo':
-        hexo_path = find_hexo_executable()
-        if hexo_path:
-            command_list[0] = hexo_path
-        else:
-            npx_path = shutil.which('npx')
-            if npx_path:
-                command_list = [npx_path, 'hexo'] + command_list[1:]
+        command_list = [*hexo_command_prefix(), *command_list[1:]]
 
     logger.info("执行命令: %s", ' '.join(command_list))
 
     try:
+        if stream:
+            returncode, output = _run_streaming(command_list, cwd)
+            if returncode != 0:
+                logger.error("命令失败 (退出码 %d)", returncode)
+                return False, output
+            return True, output
+
         result = subprocess.run(
             command_list,
             cwd=str(cwd),
@@ -125,8 +186,5 @@ def sanitize_filename(filename):
     Returns:
         Sanitized filename safe for filesystem
     """
-    filename = re.sub(r'[<>:"/\\|?*]', '-', filename)
-    filename = re.sub(r'\s+', '-', filename)
-    filename = filename.strip('-')
-    filename = re.sub(r'-+', '-', filename)
-    return filename
+    filename = _DASH_RUN_RE.sub('-', filename.translate(_SANITIZE_TABLE))
+    return filename.strip('-')
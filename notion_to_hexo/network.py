@@ -4,19 +4,105 @@ Network utilities for Notion to Hexo.
 Provides HTTP request functionality with timeout and retry support.
 """
 
+import json
 import time
+import random
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .config import TIMEOUT_API, TIMEOUT_IMAGE, MAX_RETRIES, RETRY_BACKOFF
 
 logger = logging.getLogger(__name__)
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the shared requests.Session, creating it on first use.
+
+    The session pools connections per host, so concurrent image downloads
+    and repeated Notion API calls reuse TCP/TLS connections instead of
+    opening a new one per request.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def json_loads(data):
+    """Parse JSON (str or bytes), using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class RateLimiter:
+    """
+    Spaces calls evenly so no more than `rate` start per second.
+
+    Thread-safe: each caller reserves the next free slot and sleeps until
+    it starts, so concurrent workers share one request budget.
+    """
+
+    def __init__(self, rate):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may send its request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Upper bound for a single backoff wait, in seconds
+MAX_BACKOFF = 30
+
+
+def _backoff(attempt, response=None):
+    """
+    Seconds to wait before the next attempt.
+
+    Honors a numeric Retry-After header when the server sends one;
+    otherwise uses exponential backoff with full jitter, so concurrent
+    workers that failed together do not retry in lockstep.
+    """
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), MAX_BACKOFF)
+    return random.uniform(0, min(RETRY_BACKOFF ** attempt, MAX_BACKOFF))
+
 
 def request_with_retry(method, url, **kwargs):
     """
     Make HTTP request with timeout and exponential backoff retry.
 
+    Requests go through the shared pooled session. Timeouts, connection
+    errors, truncated responses, 5xx responses and 429 (rate limited) are
+    retried; other 4xx responses are raised immediately.
+
     Args:
         method: 'get', 'post', etc.
         url: Target URL
@@ -37,28 +123,34 @@ def request_with_retry(method, url, **kwargs):
 
     for attempt in range(MAX_RETRIES):
         try:
-            response = getattr(requests, method)(url, **kwargs)
+            response = getattr(get_session(), method)(url, **kwargs)
             response.raise_for_status()
             return response
         except requests.exceptions.Timeout as e:
             last_exception = e
-            wait_time = RETRY_BACKOFF ** attempt
-            logger.warning("请求超时 (尝试 %d/%d), %d秒后重试...",
+            wait_time = _backoff(attempt)
+            logger.warning("请求超时 (尝试 %d/%d), %.1f秒后重试...",
                            attempt + 1, MAX_RETRIES, wait_time)
             time.sleep(wait_time)
-        except requests.exceptions.ConnectionError as e:
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError) as e:
             last_exception = e
-            wait_time = RETRY_BACKOFF ** attempt
-            logger.warning("连接错误 (尝试 %d/%d), %d秒后重试...",
+            wait_time = _backoff(attempt)
+            logger.warning("连接错误 (尝试 %d/%d), %.1f秒后重试...",
                            attempt + 1, MAX_RETRIES, wait_time)
             time.sleep(wait_time)
         except requests.exceptions.HTTPError as e:
-            if e.response is not None and 400 <= e.response.status_code < 500:
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and 400 <= status < 500 and status != 429:
                 raise
             last_exception = e
-            wait_time = RETRY_BACKOFF ** attempt
-            logger.warning("服务器错误 (尝试 %d/%d), %d秒后重试...",
-                           attempt + 1, MAX_RETRIES, wait_time)
+            wait_time = _backoff(attempt, e.response)
+            if status == 429:
+                logger.warning("请求过于频繁 (尝试 %d/%d), %.1f秒后重试...",
+                               attempt + 1, MAX_RETRIES, wait_time)
+            else:
+                logger.warning("服务器错误 (尝试 %d/%d), %.1f秒后重试...",
+                               attempt + 1, MAX_RETRIES, wait_time)
             time.sleep(wait_time)
 
     if last_exception is not None:
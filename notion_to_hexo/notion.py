@@ -6,47 +6,54 @@ Provides functions for fetching content from the Notion API.
 
 import re
 import logging
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 
-from .config import config
-from .network import request_with_retry
+from .config import config, NOTION_WORKERS, NOTION_RATE_LIMIT
+from .network import RateLimiter, json_loads, request_with_retry
+from .cache import cache_get, cache_put
 from .converter import blocks_to_markdown
 from .exceptions import NotionAPIError
 
 logger = logging.getLogger(__name__)
 
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+# Shared by all Notion API calls, including concurrent child-block fetches
+_notion_rate_limiter = RateLimiter(NOTION_RATE_LIMIT)
+_DISPLAY_MATH_RE = re.compile(r'\$\$.+?\$\$', re.DOTALL)
+_INLINE_MATH_RE = re.compile(r'(?<!\$)\$(?!\s)(?!\$).+?(?<!\s)(?<!\$)\$(?!\$)')
+
+# Converted page content, keyed by page ID and last_edited_time. Entries
+# also expire after PAGE_CACHE_TTL because the signed URLs of files hosted
+# by Notion (images) stop working after about an hour.
+PAGE_CACHE_TTL = 50 * 60  # seconds
+
+# Notion rounds last_edited_time down to the minute, so an edit made in the
+# same minute as a fetch keeps the same timestamp. Pages edited more recently
+# than this are not cached.
+PAGE_CACHE_MIN_AGE = 60  # seconds
+
 
 def extract_notion_page_id(url):
     """
     Extract page ID from a Notion URL.
 
+    The ID is the last 32 hex digits of the final path segment, with or
+    without UUID dashes (e.g. ".../Page-Title-<id>" or ".../<uuid>").
+
     Args:
         url: Notion page URL
 
     Returns:
         UUID formatted page ID, or None if extraction fails
     """
-    url_path = url.split('?')[0]
-
-    match = re.search(r'([a-f0-9]{32})$', url_path, re.IGNORECASE)
-    if match:
-        page_id = match.group(1).lower()
-        return f"{page_id[:8]}-{page_id[8:12]}-{page_id[12:16]}-{page_id[16:20]}-{page_id[20:]}"
+    last_segment = url.split('?', 1)[0].rsplit('/', 1)[-1].replace('-', '')
+    page_id = last_segment[-32:].lower()
 
-    match = re.search(
-        r'([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})$',
-        url_path,
-        re.IGNORECASE
-    )
-    if match:
-        return match.group(1).lower()
-
-    last_segment = url_path.split('/')[-1].replace('-', '')
-    match = re.search(r'([a-f0-9]{32})$', last_segment, re.IGNORECASE)
-    if match:
-        page_id = match.group(1).lower()
-        return f"{page_id[:8]}-{page_id[8:12]}-{page_id[12:16]}-{page_id[16:20]}-{page_id[20:]}"
-
-    return None
+    if len(page_id) != 32 or not _HEX_DIGITS.issuperset(page_id):
+        return None
+    return f"{page_id[:8]}-{page_id[8:12]}-{page_id[12:16]}-{page_id[16:20]}-{page_id[20:]}"
 
 
 def _fetch_all_blocks(parent_id, headers):
@@ -73,10 +80,11 @@ def _fetch_all_blocks(parent_id, headers):
         if start_cursor:
             params['start_cursor'] = start_cursor
 
+        _notion_rate_limiter.wait()
         response = request_with_retry(
             'get', url, headers=headers, params=params, timeout_type='api'
         )
-        data = response.json()
+        data = json_loads(response.content)
         all_blocks.extend(data.get('results', []))
         has_more = data.get('has_more', False)
         start_cursor = data.get('next_cursor')
@@ -85,6 +93,72 @@ def _fetch_all_blocks(parent_id, headers):
     return all_blocks
 
 
+def _fetch_block_tree(blocks, headers):
+    """
+    Fetch the children of every nested block, one tree level at a time.
+
+    All blocks with children at the same depth are fetched concurrently
+    (within the Notion rate limit), so a page costs one round of requests
+    per nesting level instead of one request per nested block.
+
+    Args:
+        blocks: Top-level blocks of the page
+        headers: HTTP headers for Notion API
+
+    Returns:
+        Dict mapping block ID to its list of child blocks, or to the
+        exception raised while fetching them
+    """
+    children_by_id = {}
+    level = [b for b in blocks if b.get('has_children')]
+
+    with ThreadPoolExecutor(max_workers=NOTION_WORKERS) as executor:
+        while level:
+            futures = {
+                block['id']: executor.submit(_fetch_all_blocks, block['id'], headers)
+                for block in level
+            }
+            level = []
+            for block_id, future in futures.items():
+                try:
+                    children = future.result()
+                except Exception as e:
+                    children_by_id[block_id] = e
+                    continue
+                children_by_id[block_id] = children
+                level.extend(b for b in children if b.get('has_children'))
+
+    return children_by_id
+
+
+def _load_cached_content(page_id, last_edited_time):
+    """Return cached Markdown for this page version, or None."""
+    if not last_edited_time:
+        return None
+    return cache_get('pages', f"{page_id}:{last_edited_time}", max_age=PAGE_CACHE_TTL)
+
+
+def _edited_seconds_ago(last_edited_time):
+    """Seconds since an ISO 8601 last_edited_time, or None if unparseable."""
+    try:
+        edited = datetime.fromisoformat(last_edited_time.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if edited.tzinfo is None:
+        edited = edited.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - edited).total_seconds()
+
+
+def _save_cached_content(page_id, last_edited_time, content):
+    """Store converted Markdown for this page version, unless it may still change."""
+    if not last_edited_time:
+        return
+    age = _edited_seconds_ago(last_edited_time)
+    if age is None or age < PAGE_CACHE_MIN_AGE:
+        return
+    cache_put('pages', f"{page_id}:{last_edited_time}", content)
+
+
 def _has_math_content(content):
     """
     Check if content contains LaTeX math formulas.
@@ -99,12 +173,12 @@ def _has_math_content(content):
         True if math formulas are detected
     """
     # Match display math: $$...$$
-    if re.search(r'\$\$.+?\$\$', content, re.DOTALL):
+    if _DISPLAY_MATH_RE.search(content):
         return True
 
     # Match inline math: $...$  (not preceded/followed by space adjacent to $)
     # Excludes: "$ 100" or "100 $" (price-like patterns)
-    if re.search(r'(?<!\$)\$(?!\s)(?!\$).+?(?<!\s)(?<!\$)\$(?!\$)', content):
+    if _INLINE_MATH_RE.search(content):
         return True
 
     # Match \[...\] display math
@@ -114,15 +188,19 @@ def _has_math_content(content):
     return False
 
 
-def fetch_notion_page(page_id, notion_token=None):
+def fetch_notion_page(page_id, notion_token=None, refresh=False):
     """
     Fetch page content using the Notion API.
 
-    Handles pagination to fetch all blocks (not limited to 100).
+    Handles pagination to fetch all blocks (not limited to 100). The
+    converted content is cached locally (see cache.py), so an
+    unchanged page only costs the page properties request on re-runs.
 
     Args:
         page_id: The Notion page ID (UUID format)
         notion_token: Optional token override
+        refresh: Ignore cached content and fetch all blocks again (the
+                 result still updates the cache)
 
     Returns:
         Tuple of (title, content_markdown, tags, category, description, mathjax)
@@ -145,11 +223,12 @@ def fetch_notion_page(page_id, notion_token=None):
     # Fetch page properties
     page_url = f'https://api.notion.com/v1/pages/{page_id}'
     try:
+        _notion_rate_limiter.wait()
         page_response = request_with_retry('get', page_url, headers=headers, timeout_type='api')
     except Exception as e:
         raise NotionAPIError(f"获取页面属性失败: {e}") from e
 
-    page_data = page_response.json()
+    page_data = json_loads(page_response.content)
     properties = page_data.get('properties', {})
 
     # Extract title
@@ -188,15 +267,38 @@ def fetch_notion_page(page_id, notion_token=None):
             mathjax = math_property.get('checkbox', False)
             mathjax_from_property = True
 
-    # Fetch all page content blocks (with pagination)
-    all_blocks = _fetch_all_blocks(page_id, headers)
-
-    # Create fetch_children callback for converter (also handles pagination)
-    def fetch_children(block_id):
-        return _fetch_all_blocks(block_id, headers)
-
-    # Convert to Markdown
-    markdown_content = blocks_to_markdown(all_blocks, fetch_children=fetch_children)
+    last_edited_time = page_data.get('last_edited_time')
+    markdown_content = None if refresh else _load_cached_content(page_id, last_edited_time)
+
+    if markdown_content is None:
+        # Fetch all page content blocks (with pagination)
+        all_blocks = _fetch_all_blocks(page_id, headers)
+
+        # Prefetch nested blocks level by level, then serve them to the converter
+        children_by_id = _fetch_block_tree(all_blocks, headers)
+
+        fetch_failed = False
+
+        def fetch_children(block_id):
+            nonlocal fetch_failed
+            children = children_by_id.get(block_id)
+            try:
+                if children is None:
+                    return _fetch_all_blocks(block_id, headers)
+                if isinstance(children, Exception):
+                    raise children
+            except Exception:
+                fetch_failed = True
+                raise
+            return children
+
+        # Convert to Markdown
+        markdown_content = blocks_to_markdown(all_blocks, fetch_children=fetch_children)
+        # Don't cache a page with missing child blocks
+        if not fetch_failed:
+            _save_cached_content(page_id, last_edited_time, markdown_content)
+    else:
+        logger.info("使用缓存的页面内容: %s", page_id)
 
     # Auto-detect math from content only if not explicitly set by property
     if not mathjax_from_property and _has_math_content(markdown_content):
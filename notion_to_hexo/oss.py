@@ -9,19 +9,157 @@ import os
 import re
 import hashlib
 import logging
-from urllib.parse import urlparse
-
-from .config import config
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, parse_qsl
+
+from .config import (
+    config,
+    IMAGE_WORKERS,
+    UPLOAD_WORKERS,
+    MULTIPART_THRESHOLD,
+    MULTIPART_PART_SIZE,
+    MULTIPART_THREADS,
+    TIMEOUT_IMAGE,
+)
 from .network import request_with_retry
+from .cache import cache_get, cache_put
 from .exceptions import OSSUploadError
 
 logger = logging.getLogger(__name__)
 
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^\)]+)\)')
+
+
+def _image_source_key(image_url):
+    """
+    Cache key for an image source URL.
+
+    Notion file URLs are presigned S3 URLs whose X-Amz-* query parameters
+    change on every fetch, while the path (which includes the file ID)
+    stays stable, so the query is dropped for them. Any other URL is keyed
+    on its full string, since its query may identify the image.
+    """
+    parsed = urlparse(image_url)
+    if any(name.lower().startswith('x-amz-') for name, _ in parse_qsl(parsed.query)):
+        return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    return image_url
+
+
+@functools.lru_cache(maxsize=1)
+def _oss2():
+    """
+    Import oss2 once, on first use.
+
+    oss2 is only needed when uploading, so it is not imported with this
+    module; a missing install is reported as an OSSUploadError.
+    """
+    try:
+        import oss2
+    except ImportError as e:
+        raise OSSUploadError("未安装 oss2。请运行: pip install oss2") from e
+    return oss2
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def _get_bucket(oss_cfg):
+    """
+    Return the shared oss2.Bucket for this config, creating it on first use.
+
+    Each Bucket owns a connection pool, so sharing one across uploads and
+    worker threads avoids a new TCP/TLS handshake per image. The pool is
+    sized for every upload worker sending multipart parts at once; oss2's
+    default of 10 would drop and reopen connections under that load.
+    """
+    key = (oss_cfg['access_key_id'], oss_cfg['access_key_secret'],
+           oss_cfg['endpoint'], oss_cfg['bucket_name'])
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            oss2 = _oss2()
+            auth = oss2.Auth(oss_cfg['access_key_id'], oss_cfg['access_key_secret'])
+            session = oss2.Session(pool_size=UPLOAD_WORKERS * MULTIPART_THREADS)
+            bucket = oss2.Bucket(auth, oss_cfg['endpoint'], oss_cfg['bucket_name'],
+                                 session=session, connect_timeout=TIMEOUT_IMAGE)
+            _buckets[key] = bucket
+    return bucket
+
+
+def _upload(object_name, oss_cfg, put):
+    """
+    Upload an object unless it is already known to exist.
+
+    Args:
+        object_name: Object name in OSS, without the img/ prefix
+        oss_cfg: OSS config dict
+        put: Callable(bucket, key) performing the actual upload
+
+    Returns:
+        URL after upload (CDN URL)
+    """
+    object_name = f"img/{object_name}"
+    cdn_url = f"https://{oss_cfg['cdn_domain']}/{object_name}"
+    cache_key = f"{oss_cfg['bucket_name']}/{object_name}"
+
+    # Objects uploaded in an earlier run skip the existence check
+    if cache_get('oss', cache_key) == cdn_url:
+        logger.info("图片已存在,跳过上传: %s", cdn_url)
+        return cdn_url
+
+    try:
+        bucket = _get_bucket(oss_cfg)
+
+        if bucket.object_exists(object_name):
+            logger.info("图片已存在,跳过上传: %s", cdn_url)
+        else:
+            put(bucket, object_name)
+            logger.info("图片已上传: %s", cdn_url)
+
+        cache_put('oss', cache_key, cdn_url)
+        return cdn_url
+    except OSSUploadError:
+        raise
+    except Exception as e:
+        raise OSSUploadError(f"上传到OSS失败: {e}") from e
+
+
+def _put_object_multipart(bucket, key, data):
+    """Upload data in MULTIPART_PART_SIZE parts, several at a time."""
+    oss2 = _oss2()
+
+    upload_id = bucket.init_multipart_upload(key).upload_id
+
+    def upload_part(part_number):
+        start = (part_number - 1) * MULTIPART_PART_SIZE
+        result = bucket.upload_part(key, upload_id, part_number,
+                                    data[start:start + MULTIPART_PART_SIZE])
+        return oss2.models.PartInfo(part_number, result.etag)
+
+    part_count = -(-len(data) // MULTIPART_PART_SIZE)
+    try:
+        with ThreadPoolExecutor(max_workers=MULTIPART_THREADS) as executor:
+            parts = list(executor.map(upload_part, range(1, part_count + 1)))
+        bucket.complete_multipart_upload(key, upload_id, parts)
+    except Exception:
+        # Keep the original error; a failed abort is only worth a debug line
+        try:
+            bucket.abort_multipart_upload(key, upload_id)
+        except Exception as e:
+            logger.debug("取消分片上传失败: %s", e)
+        raise
+
 
 def upload_to_oss(file_path, object_name=None, oss_config=None):
     """
     Upload file to Aliyun OSS.
 
+    Objects already uploaded in this or an earlier run (see cache.py)
+    are returned from the cache without contacting OSS.
+
     Args:
         file_path: Local file path
         object_name: Object name in OSS. If None, uses the filename.
@@ -33,102 +171,194 @@ def upload_to_oss(file_path, object_name=None, oss_config=None):
     Raises:
         OSSUploadError: If upload fails
     """
-    import oss2
-
     oss_cfg = oss_config or config.oss_config
 
     if object_name is None:
         object_name = os.path.basename(file_path)
 
-    object_name = f"img/{object_name}"
+    def put(bucket, key):
+        # Uploads parts in parallel above the threshold, a single PUT below it
+        _oss2().resumable_upload(
+            bucket, key, str(file_path),
+            multipart_threshold=MULTIPART_THRESHOLD,
+            part_size=MULTIPART_PART_SIZE,
+            num_threads=MULTIPART_THREADS,
+        )
 
-    try:
-        auth = oss2.Auth(oss_cfg['access_key_id'], oss_cfg['access_key_secret'])
-        bucket = oss2.Bucket(auth, oss_cfg['endpoint'], oss_cfg['bucket_name'])
+    return _upload(object_name, oss_cfg, put)
 
-        if bucket.object_exists(object_name):
-            cdn_url = f"https://{oss_cfg['cdn_domain']}/{object_name}"
-            logger.info("图片已存在,跳过上传: %s", cdn_url)
-            return cdn_url
 
-        bucket.put_object_from_file(object_name, file_path)
+def upload_bytes_to_oss(data, object_name, oss_config=None):
+    """
+    Upload in-memory data to Aliyun OSS.
 
-        cdn_url = f"https://{oss_cfg['cdn_domain']}/{object_name}"
-        logger.info("图片已上传: %s", cdn_url)
-        return cdn_url
-    except Exception as e:
-        raise OSSUploadError(f"上传到OSS失败: {e}") from e
+    Same as upload_to_oss(), but sends the bytes directly instead of
+    reading them from a local file. Data larger than MULTIPART_THRESHOLD
+    is sent as a multipart upload with parts in parallel.
 
+    Args:
+        data: Object content (bytes)
+        object_name: Object name in OSS
+        oss_config: Optional OSS config override
 
-def download_notion_image(image_url, save_dir):
+    Returns:
+        URL after upload (CDN URL)
+
+    Raises:
+        OSSUploadError: If upload fails
     """
-    Download image from Notion.
+    oss_cfg = oss_config or config.oss_config
+
+    def put(bucket, key):
+        if len(data) > MULTIPART_THRESHOLD:
+            _put_object_multipart(bucket, key, data)
+        else:
+            bucket.put_object(key, data)
+
+    return _upload(object_name, oss_cfg, put)
+
+
+def fetch_notion_image(image_url):
+    """
+    Download image from Notion into memory.
+
+    The returned filename is derived from a hash of the content, so the
+    same image embedded in different blocks or pages maps to a single
+    OSS object.
 
     Args:
         image_url: Image URL from Notion
-        save_dir: Directory to save the downloaded image
 
     Returns:
-        Path to the saved file
+        Tuple of (data, filename)
     """
-    parsed = urlparse(image_url)
-    path_parts = parsed.path.split('/')
-
-    if len(path_parts) >= 3:
-        image_uuid = path_parts[-2]
-        original_name = path_parts[-1]
-        ext = os.path.splitext(original_name)[1] or '.png'
-        filename = f"notion_{image_uuid[:8]}{ext}"
-    else:
-        url_hash = hashlib.md5(image_url.encode()).hexdigest()[:8]
-        ext = os.path.splitext(parsed.path)[1] or '.png'
-        filename = f"notion_{url_hash}{ext}"
-
-    filepath = os.path.join(save_dir, filename)
+    ext = os.path.splitext(urlparse(image_url).path)[1] or '.png'
 
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
     }
 
+    # Read the body in one call; response.content would assemble it from
+    # 10 KiB chunks in a Python loop
     response = request_with_retry('get', image_url, headers=headers, stream=True, timeout_type='image')
+    with response:
+        data = response.raw.read(decode_content=True)
 
+    filename = f"notion_{hashlib.blake2b(data, digest_size=8).hexdigest()}{ext}"
+    return data, filename
+
+
+def download_notion_image(image_url, save_dir):
+    """
+    Download image from Notion.
+
+    Args:
+        image_url: Image URL from Notion
+        save_dir: Directory to save the downloaded image
+
+    Returns:
+        Path to the saved file, named as in fetch_notion_image()
+    """
+    data, filename = fetch_notion_image(image_url)
+
+    filepath = os.path.join(save_dir, filename)
     with open(filepath, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+        f.write(data)
 
     return filepath
 
 
-def process_images_in_markdown(markdown_content, temp_dir, oss_config=None):
+def _transfer_images(image_urls, oss_cfg, url_map):
+    """Download and upload images, adding each source URL's CDN URL to url_map."""
+    with ThreadPoolExecutor(max_workers=min(IMAGE_WORKERS, len(image_urls))) as download_pool, \
+            ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(image_urls))) as upload_pool:
+        downloads = {}
+        for image_url in image_urls:
+            logger.info("处理图片: %s", image_url[:80])
+            downloads[download_pool.submit(fetch_notion_image, image_url)] = image_url
+
+        # Different URLs with identical content share one upload
+        uploads = {}
+        for future in as_completed(downloads):
+            image_url = downloads[future]
+            try:
+                data, filename = future.result()
+            except Exception as e:
+                logger.warning("图片处理失败: %s, 错误: %s", image_url[:80], e)
+                continue
+            if filename not in uploads:
+                uploads[filename] = (upload_pool.submit(upload_bytes_to_oss, data, filename, oss_cfg), [])
+            uploads[filename][1].append(image_url)
+
+        for future, urls in uploads.values():
+            try:
+                oss_url = future.result()
+            except Exception as e:
+                logger.warning("图片处理失败: %s, 错误: %s", urls[0][:80], e)
+                continue
+            for image_url in urls:
+                url_map[image_url] = oss_url
+                cache_put('image_urls', _image_source_key(image_url), oss_url)
+
+
+def process_images_in_markdown(markdown_content, temp_dir=None, oss_config=None):
     """
     Process images in Markdown content, download and upload to OSS.
 
+    Each distinct image URL is downloaded once, and each distinct image
+    content is uploaded once. Downloads and uploads run
+    on separate thread pools, and an image is handed to the upload pool as
+    soon as its download finishes, so uploads of early images overlap the
+    downloads of later ones. Images that fail keep their original URL.
+
+    Images uploaded in an earlier run are recognised by their source URL
+    and replaced without being downloaded again.
+
     Args:
         markdown_content: Markdown content with image references
-        temp_dir: Temporary directory for downloaded images
+        temp_dir: Unused; images are uploaded from memory. Kept for
+                  backwards compatibility.
         oss_config: Optional OSS config override
 
     Returns:
         Processed Markdown content with OSS URLs
     """
-    oss_cfg = oss_config or config.oss_config
-
-    image_pattern = r'!\[([^\]]*)\]\(([^\)]+)\)'
+    # Cheap substring test before running the regex over the whole post
+    if '![' not in markdown_content:
+        return markdown_content
 
-    def replace_image(match):
-        alt_text = match.group(1)
-        image_url = match.group(2)
-
-        if oss_cfg['cdn_domain'] in image_url:
-            return match.group(0)
-
-        try:
-            logger.info("处理图片: %s", image_url[:80])
-            local_path = download_notion_image(image_url, temp_dir)
-            oss_url = upload_to_oss(local_path, oss_config=oss_cfg)
-            return f"![{alt_text}]({oss_url})"
-        except Exception as e:
-            logger.warning("图片处理失败: %s, 错误: %s", image_url[:80], e)
-            return match.group(0)
+    oss_cfg = oss_config or config.oss_config
 
-    return re.sub(image_pattern, replace_image, markdown_content)
+    # Scan once; the matches are reused to rebuild the content below.
+    # Unique URLs are collected so duplicates are only transferred once.
+    matches = list(_IMAGE_RE.finditer(markdown_content))
+    image_urls = list(dict.fromkeys(
+        m.group(2) for m in matches
+        if oss_cfg['cdn_domain'] not in m.group(2)
+    ))
+    if not image_urls:
+        return markdown_content
+
+    url_map = {}
+    cdn_prefix = f"https://{oss_cfg['cdn_domain']}/"
+    pending = []
+    for image_url in image_urls:
+        cached = cache_get('image_urls', _image_source_key(image_url))
+        if cached and cached.startswith(cdn_prefix):
+            url_map[image_url] = cached
+        else:
+            pending.append(image_url)
+
+    if pending:
+        _transfer_images(pending, oss_cfg, url_map)
+
+    parts = []
+    pos = 0
+    for m in matches:
+        oss_url = url_map.get(m.group(2))
+        if oss_url is not None:
+            parts.append(markdown_content[pos:m.start()])
+            parts.append(f"![{m.group(1)}]({oss_url})")
+            pos = m.end()
+    parts.append(markdown_content[pos:])
+    return ''.join(parts)
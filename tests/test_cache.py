@@ -0,0 +1,37 @@
+"""Tests for cache module."""
+
+import pytest
+
+from notion_to_hexo import cache
+from notion_to_hexo.cache import cache_get, cache_put
+
+
+@pytest.fixture(autouse=True)
+def cache_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_PATH', tmp_path / 'cache.db')
+
+
+class TestCache:
+    def test_roundtrip(self):
+        cache_put('pages', 'a', 'content')
+        assert cache_get('pages', 'a') == 'content'
+
+    def test_missing_key(self):
+        assert cache_get('pages', 'missing') is None
+
+    def test_namespaces_are_separate(self):
+        cache_put('pages', 'a', 'page')
+        assert cache_get('oss', 'a') is None
+
+    def test_put_replaces(self):
+        cache_put('pages', 'a', 'old')
+        cache_put('pages', 'a', 'new')
+        assert cache_get('pages', 'a') == 'new'
+
+    def test_expired_entry_ignored(self, monkeypatch):
+        monkeypatch.setattr(cache.time, 'time', lambda: 1000.0)
+        cache_put('pages', 'a', 'content')
+        monkeypatch.setattr(cache.time, 'time', lambda: 2000.0)
+
+        assert cache_get('pages', 'a', max_age=500) is None
+        assert cache_get('pages', 'a', max_age=5000) == 'content'
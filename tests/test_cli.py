@@ -1,9 +1,32 @@
 """Tests for cli module."""
 
+import socket
+import threading
+
 import pytest
 import yaml
+from unittest.mock import MagicMock, patch
+
+from notion_to_hexo import cache, cli
+from notion_to_hexo.cli import (
+    _build_front_matter, _prompt_oss_config, _run_in_background, _wait_for_server, _write_post,
+    build_parser,
+    generate_metadata_with_llm, generate_summary_with_llm,
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_PATH', tmp_path / 'cache.db')
 
-from notion_to_hexo.cli import _build_front_matter, build_parser
+
+class TestWritePost:
+    def test_writes_front_matter_and_content(self, tmp_path):
+        path = tmp_path / 'post.md'
+        _write_post(path, {'title': '标题'}, '正文\n')
+
+        assert path.read_text(encoding='utf-8') == '---\ntitle: 标题\n---\n\n正文\n'
+        assert list(tmp_path.iterdir()) == [path]
 
 
 class TestBuildFrontMatter:
@@ -68,6 +91,12 @@ class TestBuildFrontMatter:
         parsed = yaml.safe_load(content)
         assert parsed['title'] == 'C# Programming'
 
+    def test_emoji_written_literally(self):
+        fm = {'title': '笔记 😀', 'tags': ['🐍']}
+        result = _build_front_matter(fm)
+        assert '笔记 😀' in result
+        assert '🐍' in result
+
     def test_with_description(self):
         fm = {
             'title': 'Test',
@@ -146,7 +175,186 @@ class TestBuildParser:
         args = parser.parse_args(['--dry-run', 'https://notion.so/page-id'])
         assert args.dry_run is True
 
+    def test_refresh(self):
+        parser = build_parser()
+        args = parser.parse_args(['--refresh', 'https://notion.so/page-id'])
+        assert args.refresh is True
+
+    def test_stream_summary(self):
+        parser = build_parser()
+        args = parser.parse_args(['--stream-summary', 'https://notion.so/page-id'])
+        assert args.stream_summary is True
+
     def test_ui_mode(self):
         parser = build_parser()
         args = parser.parse_args(['--ui'])
         assert args.ui is True
+
+
+class TestRunInBackground:
+    def test_returns_result(self):
+        assert _run_in_background(lambda a, b=0: a + b, 1, b=2).result(timeout=5) == 3
+
+    def test_propagates_exception(self):
+        def fail():
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            _run_in_background(fail).result(timeout=5)
+
+    def test_thread_does_not_block_exit(self):
+        assert _run_in_background(lambda: threading.current_thread().daemon).result(timeout=5)
+
+
+class TestWaitForServer:
+    def test_ready_when_port_accepts(self):
+        with socket.socket() as server:
+            server.bind(('localhost', 0))
+            server.listen()
+            process = MagicMock()
+            process.poll.return_value = None
+
+            assert _wait_for_server(process, port=server.getsockname()[1], timeout=2)
+
+    def test_exited_process(self):
+        process = MagicMock()
+        process.poll.return_value = 1
+
+        assert not _wait_for_server(process, port=1, timeout=2)
+
+
+def _llm_response(status_code, text=''):
+    response = MagicMock()
+    response.status_code = status_code
+    response.output.choices[0].message.content = text
+    return response
+
+
+@pytest.fixture
+def generation(monkeypatch):
+    """Provide a mocked dashscope Generation API."""
+    monkeypatch.setattr(cli.config, 'dashscope_api_key', 'key')
+    module = MagicMock()
+    with patch.dict('sys.modules', {'dashscope': module}), \
+            patch('notion_to_hexo.cli.time.sleep'):
+        yield module.Generation
+
+
+class TestGenerateSummaryWithLlm:
+    def test_throttled_call_is_retried(self, generation):
+        generation.call.side_effect = [_llm_response(429), _llm_response(200, ' 摘要 ')]
+
+        assert generate_summary_with_llm('内容', '标题') == '摘要'
+        assert generation.call.call_count == 2
+        assert generation.call.call_args.kwargs['request_timeout'] == cli.TIMEOUT_LLM
+
+    def test_client_error_not_retried(self, generation):
+        generation.call.return_value = _llm_response(400)
+
+        assert generate_summary_with_llm('内容', '标题') is None
+        generation.call.assert_called_once()
+
+    def test_stream_prints_chunks(self, generation, capsys):
+        generation.call.return_value = iter([_llm_response(200, '第一'), _llm_response(200, '第二')])
+
+        assert generate_summary_with_llm('内容', '标题', stream=True) == '第一第二'
+        assert generation.call.call_args.kwargs['stream'] is True
+        assert '生成的摘要: 第一第二\n' in capsys.readouterr().out
+
+    def test_stream_not_retried_after_output(self, generation):
+        generation.call.return_value = iter([_llm_response(200, '第一'), _llm_response(500)])
+
+        assert generate_summary_with_llm('内容', '标题', stream=True) is None
+        generation.call.assert_called_once()
+
+    def test_result_cached_for_same_article(self, generation, capsys):
+        generation.call.return_value = _llm_response(200, '摘要')
+
+        assert generate_summary_with_llm('内容', '标题') == '摘要'
+        assert generate_summary_with_llm('内容', '标题', stream=True) == '摘要'
+        generation.call.assert_called_once()
+        assert '生成的摘要: 摘要\n' in capsys.readouterr().out
+
+        generate_summary_with_llm('新内容', '标题')
+        assert generation.call.call_count == 2
+
+    def test_refresh_bypasses_cache(self, generation):
+        generation.call.side_effect = [_llm_response(200, '旧摘要'), _llm_response(200, '新摘要')]
+        generate_summary_with_llm('内容', '标题')
+
+        assert generate_summary_with_llm('内容', '标题', refresh=True) == '新摘要'
+        assert generate_summary_with_llm('内容', '标题') == '新摘要'
+
+    def test_expired_result_regenerated(self, generation, monkeypatch):
+        generation.call.return_value = _llm_response(200, '摘要')
+        monkeypatch.setattr(cache.time, 'time', lambda: 1000.0)
+        generate_summary_with_llm('内容', '标题')
+
+        monkeypatch.setattr(cache.time, 'time', lambda: 1000.0 + cli.LLM_CACHE_TTL + 1)
+        generate_summary_with_llm('内容', '标题')
+        assert generation.call.call_count == 2
+
+    def test_gives_up_after_retries(self, generation):
+        generation.call.side_effect = TimeoutError()
+
+        assert generate_summary_with_llm('内容', '标题') is None
+        assert generation.call.call_count == cli.MAX_RETRIES
+
+
+class TestGenerateMetadataWithLlm:
+    @patch('notion_to_hexo.cli._call_llm')
+    def test_parses_fenced_json(self, mock_call):
+        mock_call.return_value = (
+            '```json\n{"summary": " 摘要 ", "tags": ["Python", " Hexo "], "category": "技术"}\n```'
+        )
+
+        assert generate_metadata_with_llm('内容', '标题') == {
+            'summary': '摘要', 'tags': ['Python', 'Hexo'], 'category': '技术',
+        }
+
+    @patch('notion_to_hexo.cli._call_llm')
+    def test_missing_fields_default_empty(self, mock_call):
+        mock_call.return_value = '{"summary": "摘要"}'
+
+        assert generate_metadata_with_llm('内容', '标题') == {
+            'summary': '摘要', 'tags': [], 'category': '',
+        }
+
+    @patch('notion_to_hexo.cli._call_llm')
+    def test_unparseable_response(self, mock_call):
+        mock_call.return_value = '这不是 JSON'
+
+        assert generate_metadata_with_llm('内容', '标题') is None
+
+    def test_unparseable_response_not_cached(self, generation):
+        generation.call.side_effect = [
+            _llm_response(200, '这不是 JSON'), _llm_response(200, '{"summary": "摘要"}'),
+        ]
+
+        assert generate_metadata_with_llm('内容', '标题') is None
+        assert generate_metadata_with_llm('内容', '标题')['summary'] == '摘要'
+        assert generation.call.call_count == 2
+
+
+class TestPromptOssConfig:
+    def test_only_missing_values_prompted(self):
+        cfg = {
+            'access_key_id': 'env-id',
+            'access_key_secret': '',
+            'bucket_name': 'env-bucket',
+            'endpoint': '',
+            'cdn_domain': '',
+        }
+        with patch('builtins.input', side_effect=['oss.example.com', '']) as mock_input, \
+                patch('notion_to_hexo.cli.getpass.getpass', return_value='secret') as mock_getpass:
+            _prompt_oss_config(cfg)
+
+        assert cfg == {
+            'access_key_id': 'env-id',
+            'access_key_secret': 'secret',
+            'bucket_name': 'env-bucket',
+            'endpoint': 'oss.example.com',
+            'cdn_domain': cli.DEFAULT_CDN_DOMAIN,
+        }
+        assert mock_input.call_count == 2
+        mock_getpass.assert_called_once()
@@ -1,9 +1,13 @@
 """Tests for hexo module."""
 
+import sys
+
 import pytest
 from unittest.mock import patch, MagicMock
 
-from notion_to_hexo.hexo import sanitize_filename, find_hexo_executable
+from notion_to_hexo.hexo import (
+    sanitize_filename, find_hexo_executable, hexo_command_prefix, run_hexo_command,
+)
 
 
 class TestSanitizeFilename:
@@ -44,8 +48,26 @@ class TestSanitizeFilename:
     def test_asterisk(self):
         assert sanitize_filename('C* Language') == 'C-Language'
 
+    def test_unicode_whitespace(self):
+        assert sanitize_filename('中文\u3000标题\xa0\t二') == '中文-标题-二'
+
 
 class TestFindHexoExecutable:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        find_hexo_executable.cache_clear()
+        hexo_command_prefix.cache_clear()
+        yield
+        find_hexo_executable.cache_clear()
+        hexo_command_prefix.cache_clear()
+
+    @patch('notion_to_hexo.hexo.shutil.which')
+    def test_result_cached(self, mock_which):
+        mock_which.return_value = '/usr/local/bin/hexo'
+        find_hexo_executable()
+        find_hexo_executable()
+        mock_which.assert_called_once()
+
     @patch('notion_to_hexo.hexo.shutil.which')
     def test_found_in_path(self, mock_which):
         mock_which.return_value = '/usr/local/bin/hexo'
@@ -89,3 +111,29 @@ class TestFindHexoExecutable:
 
             result = find_hexo_executable()
             assert result is None  # Signals to use npx
+
+    @patch('notion_to_hexo.hexo.find_hexo_executable', return_value=None)
+    @patch('notion_to_hexo.hexo.shutil.which', return_value='/usr/local/bin/npx')
+    def test_command_prefix_falls_back_to_npx(self, mock_which, mock_find):
+        assert hexo_command_prefix() == ('/usr/local/bin/npx', 'hexo')
+
+
+class TestRunHexoCommand:
+    def test_stream_echoes_output(self, tmp_path, capsys):
+        success, output = run_hexo_command(
+            [sys.executable, '-c', 'import sys; print("out"); print("err", file=sys.stderr)'],
+            cwd=tmp_path, stream=True,
+        )
+
+        assert success
+        assert sorted(output.split()) == ['err', 'out']
+        assert sorted(capsys.readouterr().out.split()) == ['err', 'out']
+
+    def test_stream_reports_failure(self, tmp_path, capsys):
+        success, output = run_hexo_command(
+            [sys.executable, '-c', 'print("bad"); raise SystemExit(2)'],
+            cwd=tmp_path, stream=True,
+        )
+
+        assert not success
+        assert output.strip() == 'bad'
@@ -0,0 +1,68 @@
+"""Tests for network module."""
+
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+
+from notion_to_hexo.network import RateLimiter, request_with_retry
+
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    return response
+
+
+class TestRequestWithRetry:
+    @patch('notion_to_hexo.network.time.sleep')
+    @patch('notion_to_hexo.network.get_session')
+    def test_rate_limited_is_retried(self, mock_session, mock_sleep):
+        ok = _response(200)
+        mock_session.return_value.get.side_effect = [_response(429), ok]
+
+        assert request_with_retry('get', 'https://api.notion.com/v1/pages/x') is ok
+        assert mock_session.return_value.get.call_count == 2
+
+    @patch('notion_to_hexo.network.time.sleep')
+    @patch('notion_to_hexo.network.get_session')
+    def test_retry_after_honored(self, mock_session, mock_sleep):
+        mock_session.return_value.get.side_effect = [
+            _response(429, {'Retry-After': '7'}), _response(200),
+        ]
+
+        request_with_retry('get', 'https://api.notion.com/v1/pages/x')
+        mock_sleep.assert_called_once_with(7)
+
+    @patch('notion_to_hexo.network.time.sleep')
+    @patch('notion_to_hexo.network.get_session')
+    def test_truncated_response_is_retried(self, mock_session, mock_sleep):
+        ok = _response(200)
+        mock_session.return_value.get.side_effect = [
+            requests.exceptions.ChunkedEncodingError(), ok,
+        ]
+
+        assert request_with_retry('get', 'https://api.notion.com/v1/pages/x') is ok
+
+    @patch('notion_to_hexo.network.time.sleep')
+    @patch('notion_to_hexo.network.get_session')
+    def test_client_error_not_retried(self, mock_session, mock_sleep):
+        mock_session.return_value.get.return_value = _response(404)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            request_with_retry('get', 'https://api.notion.com/v1/pages/x')
+        assert mock_session.return_value.get.call_count == 1
+
+
+class TestRateLimiter:
+    @patch('notion_to_hexo.network.time.sleep')
+    @patch('notion_to_hexo.network.time.monotonic', return_value=100.0)
+    def test_calls_are_spaced(self, mock_monotonic, mock_sleep):
+        limiter = RateLimiter(4)
+        for _ in range(3):
+            limiter.wait()
+
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        assert delays == [0.25, 0.5]
@@ -1,9 +1,21 @@
 """Tests for notion module."""
 
+import json
+from datetime import datetime, timezone
+
 import pytest
 from unittest.mock import patch, MagicMock
 
-from notion_to_hexo.notion import extract_notion_page_id, _has_math_content, _fetch_all_blocks
+from notion_to_hexo import cache, notion
+from notion_to_hexo.notion import (
+    extract_notion_page_id, _has_math_content, _fetch_all_blocks, _fetch_block_tree,
+    fetch_notion_page,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    monkeypatch.setattr(notion, '_notion_rate_limiter', MagicMock())
 
 
 class TestExtractNotionPageId:
@@ -73,11 +85,11 @@ class TestFetchAllBlocks:
     @patch('notion_to_hexo.notion.request_with_retry')
     def test_single_page(self, mock_request):
         mock_response = MagicMock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'results': [{'id': 'block1', 'type': 'paragraph'}],
             'has_more': False,
             'next_cursor': None,
-        }
+        }).encode()
         mock_request.return_value = mock_response
 
         headers = {'Authorization': 'Bearer test'}
@@ -91,18 +103,18 @@ class TestFetchAllBlocks:
     def test_pagination(self, mock_request):
         """Verify that pagination fetches all blocks across multiple pages."""
         response1 = MagicMock()
-        response1.json.return_value = {
+        response1.content = json.dumps({
             'results': [{'id': f'block{i}', 'type': 'paragraph'} for i in range(100)],
             'has_more': True,
             'next_cursor': 'cursor1',
-        }
+        }).encode()
 
         response2 = MagicMock()
-        response2.json.return_value = {
+        response2.content = json.dumps({
             'results': [{'id': f'block{i}', 'type': 'paragraph'} for i in range(100, 150)],
             'has_more': False,
             'next_cursor': None,
-        }
+        }).encode()
 
         mock_request.side_effect = [response1, response2]
 
@@ -115,3 +127,95 @@ class TestFetchAllBlocks:
         # Verify second call includes start_cursor
         second_call_kwargs = mock_request.call_args_list[1]
         assert second_call_kwargs[1]['params'] == {'start_cursor': 'cursor1'}
+
+
+class TestFetchBlockTree:
+    @patch('notion_to_hexo.notion._fetch_all_blocks')
+    def test_fetches_every_level(self, mock_fetch):
+        tree = {
+            'a': [{'id': 'a1', 'has_children': True}, {'id': 'a2'}],
+            'b': [{'id': 'b1'}],
+            'a1': [{'id': 'a1x'}],
+        }
+        mock_fetch.side_effect = lambda block_id, headers: tree[block_id]
+
+        blocks = [{'id': 'a', 'has_children': True}, {'id': 'b', 'has_children': True}, {'id': 'c'}]
+        result = _fetch_block_tree(blocks, {})
+
+        assert result == tree
+        assert mock_fetch.call_count == 3
+
+    @patch('notion_to_hexo.notion._fetch_all_blocks')
+    def test_failure_is_recorded(self, mock_fetch):
+        error = RuntimeError('boom')
+        mock_fetch.side_effect = error
+
+        result = _fetch_block_tree([{'id': 'a', 'has_children': True}], {})
+        assert result == {'a': error}
+
+
+class TestFetchNotionPageCache:
+    PAGE = {
+        'last_edited_time': '2025-01-24T12:00:00.000Z',
+        'properties': {'title': {'title': [{'plain_text': 'Hello'}]}},
+    }
+    BLOCKS = [{
+        'type': 'paragraph',
+        'paragraph': {'rich_text': [{'plain_text': 'Body'}]},
+    }]
+
+    @pytest.fixture(autouse=True)
+    def cache_db(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, 'CACHE_PATH', tmp_path / 'cache.db')
+
+    @patch('notion_to_hexo.notion._fetch_all_blocks')
+    @patch('notion_to_hexo.notion.request_with_retry')
+    def test_unchanged_page_served_from_cache(self, mock_request, mock_blocks):
+        mock_request.return_value.content = json.dumps(self.PAGE).encode()
+        mock_blocks.return_value = self.BLOCKS
+
+        first = fetch_notion_page('page-id', notion_token='token')
+        second = fetch_notion_page('page-id', notion_token='token')
+
+        assert first == second
+        assert first[1].strip() == 'Body'
+        mock_blocks.assert_called_once()
+
+    @patch('notion_to_hexo.notion._fetch_all_blocks')
+    @patch('notion_to_hexo.notion.request_with_retry')
+    def test_edited_page_refetched(self, mock_request, mock_blocks):
+        mock_request.return_value.content = json.dumps(self.PAGE).encode()
+        mock_blocks.return_value = self.BLOCKS
+        fetch_notion_page('page-id', notion_token='token')
+
+        mock_request.return_value.content = json.dumps(
+            dict(self.PAGE, last_edited_time='2025-01-25T08:00:00.000Z')
+        ).encode()
+        fetch_notion_page('page-id', notion_token='token')
+
+        assert mock_blocks.call_count == 2
+
+    @patch('notion_to_hexo.notion._fetch_all_blocks')
+    @patch('notion_to_hexo.notion.request_with_retry')
+    def test_page_edited_this_minute_not_cached(self, mock_request, mock_blocks):
+        just_now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:00.000Z')
+        mock_request.return_value.content = json.dumps(
+            dict(self.PAGE, last_edited_time=just_now)
+        ).encode()
+        mock_blocks.return_value = self.BLOCKS
+
+        fetch_notion_page('page-id', notion_token='token')
+        fetch_notion_page('page-id', notion_token='token')
+
+        assert mock_blocks.call_count == 2
+
+    @patch('notion_to_hexo.notion._fetch_all_blocks')
+    @patch('notion_to_hexo.notion.request_with_retry')
+    def test_refresh_bypasses_cache(self, mock_request, mock_blocks):
+        mock_request.return_value.content = json.dumps(self.PAGE).encode()
+        mock_blocks.return_value = self.BLOCKS
+        fetch_notion_page('page-id', notion_token='token')
+
+        fetch_notion_page('page-id', notion_token='token', refresh=True)
+
+        assert mock_blocks.call_count == 2
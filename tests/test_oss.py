@@ -0,0 +1,226 @@
+"""Tests for oss module."""
+
+import os
+import hashlib
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from notion_to_hexo import cache, oss
+from notion_to_hexo.exceptions import OSSUploadError
+from notion_to_hexo.oss import (
+    download_notion_image, fetch_notion_image, process_images_in_markdown,
+    upload_bytes_to_oss, upload_to_oss,
+)
+
+
+OSS_CFG = {
+    'access_key_id': 'id',
+    'access_key_secret': 'secret',
+    'bucket_name': 'bucket',
+    'endpoint': 'oss.example.com',
+    'cdn_domain': 'cdn.example.com',
+}
+
+
+@pytest.fixture(autouse=True)
+def cache_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_PATH', tmp_path / 'cache.db')
+
+
+class TestProcessImagesInMarkdown:
+    @patch('notion_to_hexo.oss.upload_bytes_to_oss')
+    @patch('notion_to_hexo.oss.fetch_notion_image')
+    def test_duplicate_urls_transferred_once(self, mock_fetch, mock_upload):
+        mock_fetch.side_effect = lambda url: (b'data', url[-5:])
+        mock_upload.side_effect = lambda data, name, oss_config=None: f"https://cdn.example.com/img/{name}"
+
+        md = (
+            "![a](https://s3.example.com/x/1.png)\n"
+            "![b](https://s3.example.com/x/2.png)\n"
+            "![c](https://s3.example.com/x/1.png)"
+        )
+        result = process_images_in_markdown(md, oss_config=OSS_CFG)
+
+        assert mock_fetch.call_count == 2
+        assert result == (
+            "![a](https://cdn.example.com/img/1.png)\n"
+            "![b](https://cdn.example.com/img/2.png)\n"
+            "![c](https://cdn.example.com/img/1.png)"
+        )
+
+    @patch('notion_to_hexo.oss.upload_bytes_to_oss')
+    @patch('notion_to_hexo.oss.fetch_notion_image')
+    def test_identical_content_uploaded_once(self, mock_fetch, mock_upload):
+        mock_fetch.return_value = (b'same', 'notion_abc.png')
+        mock_upload.return_value = 'https://cdn.example.com/img/notion_abc.png'
+
+        md = "![a](https://s3.example.com/x/1.png) ![b](https://s3.example.com/y/2.png)"
+        result = process_images_in_markdown(md, oss_config=OSS_CFG)
+
+        mock_upload.assert_called_once()
+        assert result.count('https://cdn.example.com/img/notion_abc.png') == 2
+
+    @patch('notion_to_hexo.oss.upload_bytes_to_oss')
+    @patch('notion_to_hexo.oss.fetch_notion_image')
+    def test_failed_image_keeps_original_url(self, mock_fetch, mock_upload):
+        mock_fetch.side_effect = RuntimeError('boom')
+
+        md = "![a](https://s3.example.com/x/1.png)"
+        assert process_images_in_markdown(md, oss_config=OSS_CFG) == md
+        mock_upload.assert_not_called()
+
+    @patch('notion_to_hexo.oss.upload_bytes_to_oss')
+    @patch('notion_to_hexo.oss.fetch_notion_image')
+    def test_known_source_not_downloaded_again(self, mock_fetch, mock_upload):
+        mock_fetch.return_value = (b'data', 'notion_abc.png')
+        mock_upload.return_value = 'https://cdn.example.com/img/notion_abc.png'
+        process_images_in_markdown("![a](https://s3.example.com/x/1.png?X-Amz-Signature=1)", oss_config=OSS_CFG)
+
+        # Same file, freshly signed URL
+        result = process_images_in_markdown(
+            "![a](https://s3.example.com/x/1.png?X-Amz-Signature=2)", oss_config=OSS_CFG,
+        )
+
+        assert result == "![a](https://cdn.example.com/img/notion_abc.png)"
+        assert mock_fetch.call_count == 1
+        assert mock_upload.call_count == 1
+
+    @patch('notion_to_hexo.oss.upload_bytes_to_oss')
+    @patch('notion_to_hexo.oss.fetch_notion_image')
+    def test_unsigned_urls_keyed_on_query(self, mock_fetch, mock_upload):
+        mock_fetch.side_effect = lambda url: (url.encode(), f"notion_{url[-3:]}.svg")
+        mock_upload.side_effect = lambda data, name, oss_config=None: f"https://cdn.example.com/img/{name}"
+        process_images_in_markdown("![a](https://latex.codecogs.com/svg.latex?x^2)", oss_config=OSS_CFG)
+
+        result = process_images_in_markdown("![b](https://latex.codecogs.com/svg.latex?y^3)", oss_config=OSS_CFG)
+
+        assert result == "![b](https://cdn.example.com/img/notion_y^3.svg)"
+        assert mock_fetch.call_count == 2
+
+    @patch('notion_to_hexo.oss.fetch_notion_image')
+    def test_no_images_returned_unchanged(self, mock_fetch):
+        md = "# Title\n\nJust text with a [link](https://example.com)."
+        assert process_images_in_markdown(md) is md
+        mock_fetch.assert_not_called()
+
+    @patch('notion_to_hexo.oss.fetch_notion_image')
+    def test_cdn_images_skipped(self, mock_fetch):
+        md = "![a](https://cdn.example.com/img/1.png)"
+        assert process_images_in_markdown(md, oss_config=OSS_CFG) == md
+        mock_fetch.assert_not_called()
+
+
+class TestFetchNotionImage:
+    @patch('notion_to_hexo.oss.request_with_retry')
+    def test_named_by_content_hash(self, mock_request):
+        data = b'fake image bytes'
+        mock_request.return_value.raw.read.return_value = data
+
+        result = fetch_notion_image('https://s3.example.com/abc/def/image.jpg?X=1')
+
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        assert result == (data, f"notion_{digest}.jpg")
+
+    @patch('notion_to_hexo.oss.request_with_retry')
+    def test_same_content_same_name(self, mock_request):
+        mock_request.return_value.raw.read.return_value = b'same'
+
+        _, first = fetch_notion_image('https://s3.example.com/a/1/x.png')
+        _, second = fetch_notion_image('https://s3.example.com/b/2/y.png')
+        assert first == second
+
+    @patch('notion_to_hexo.oss.request_with_retry')
+    def test_download_writes_file(self, mock_request, tmp_path):
+        mock_request.return_value.raw.read.return_value = b'bytes'
+
+        path = download_notion_image('https://s3.example.com/a/1/x.png', str(tmp_path))
+        assert (tmp_path / os.path.basename(path)).read_bytes() == b'bytes'
+
+
+@pytest.fixture
+def fake_oss2(monkeypatch):
+    """Provide a mocked oss2 module."""
+    monkeypatch.setattr(oss, '_buckets', {})
+    module = MagicMock()
+    oss._oss2.cache_clear()
+    with patch.dict('sys.modules', {'oss2': module}):
+        yield module
+    oss._oss2.cache_clear()
+
+
+class TestUploadToOss:
+    def test_uploads_new_object(self, fake_oss2):
+        bucket = fake_oss2.Bucket.return_value
+        bucket.object_exists.return_value = False
+
+        url = upload_to_oss('/tmp/a.png', oss_config=OSS_CFG)
+
+        assert url == 'https://cdn.example.com/img/a.png'
+        fake_oss2.resumable_upload.assert_called_once()
+        assert fake_oss2.resumable_upload.call_args[0] == (bucket, 'img/a.png', '/tmp/a.png')
+
+    def test_uploads_bytes(self, fake_oss2):
+        bucket = fake_oss2.Bucket.return_value
+        bucket.object_exists.return_value = False
+
+        url = upload_bytes_to_oss(b'data', 'a.png', oss_config=OSS_CFG)
+
+        assert url == 'https://cdn.example.com/img/a.png'
+        bucket.put_object.assert_called_once_with('img/a.png', b'data')
+
+    def test_bucket_shared_across_uploads(self, fake_oss2):
+        fake_oss2.Bucket.return_value.object_exists.return_value = False
+
+        upload_bytes_to_oss(b'a', 'a.png', oss_config=OSS_CFG)
+        upload_bytes_to_oss(b'b', 'b.png', oss_config=OSS_CFG)
+
+        fake_oss2.Bucket.assert_called_once()
+
+    def test_large_bytes_use_multipart(self, fake_oss2, monkeypatch):
+        monkeypatch.setattr(oss, 'MULTIPART_THRESHOLD', 10)
+        monkeypatch.setattr(oss, 'MULTIPART_PART_SIZE', 4)
+        bucket = fake_oss2.Bucket.return_value
+        bucket.object_exists.return_value = False
+
+        upload_bytes_to_oss(b'0123456789AB', 'big.png', oss_config=OSS_CFG)
+
+        bucket.put_object.assert_not_called()
+        sent = sorted((c[0][2], c[0][3]) for c in bucket.upload_part.call_args_list)
+        assert sent == [(1, b'0123'), (2, b'4567'), (3, b'89AB')]
+        bucket.complete_multipart_upload.assert_called_once()
+
+    def test_failed_abort_keeps_original_error(self, fake_oss2, monkeypatch):
+        monkeypatch.setattr(oss, 'MULTIPART_THRESHOLD', 10)
+        monkeypatch.setattr(oss, 'MULTIPART_PART_SIZE', 4)
+        bucket = fake_oss2.Bucket.return_value
+        bucket.object_exists.return_value = False
+        bucket.upload_part.side_effect = ConnectionError('part failed')
+        bucket.abort_multipart_upload.side_effect = ConnectionError('abort failed')
+
+        with pytest.raises(OSSUploadError, match='part failed'):
+            upload_bytes_to_oss(b'0123456789AB', 'big.png', oss_config=OSS_CFG)
+        bucket.abort_multipart_upload.assert_called_once()
+
+    def test_second_upload_served_from_cache(self, fake_oss2):
+        bucket = fake_oss2.Bucket.return_value
+        bucket.object_exists.return_value = True
+
+        upload_to_oss('/tmp/a.png', oss_config=OSS_CFG)
+        url = upload_to_oss('/tmp/a.png', oss_config=OSS_CFG)
+
+        assert url == 'https://cdn.example.com/img/a.png'
+        assert bucket.object_exists.call_count == 1
+        fake_oss2.resumable_upload.assert_not_called()
+
+    def test_cache_persists_across_runs(self, fake_oss2):
+        fake_oss2.Bucket.return_value.object_exists.return_value = False
+        upload_to_oss('/tmp/a.png', oss_config=OSS_CFG)
+
+        # Simulate a new process
+        oss._buckets.clear()
+        fake_oss2.reset_mock()
+
+        url = upload_to_oss('/tmp/a.png', oss_config=OSS_CFG)
+        assert url == 'https://cdn.example.com/img/a.png'
+        fake_oss2.Bucket.assert_not_called()
@@ -0,0 +1,174 @@
+"""Tests for llm_test.summary_generator module."""
+
+import json
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+from llm_test import summary_generator
+from llm_test.summary_generator import (
+    LLMConfig, _RateLimiter, _build_messages, _cache_get, _cache_key, _cache_put, _parse_combined_summaries,
+    generate_summaries_combined, generate_summary,
+)
+
+CONFIG = LLMConfig(api_key='key')
+ITEMS = [('标题A', '正文A'), ('标题B', '正文B'), ('标题C', '正文C')]
+
+
+@pytest.fixture(autouse=True)
+def summary_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(summary_generator, 'SUMMARY_CACHE_PATH', tmp_path / 'summaries.db')
+
+
+def _response(status_code, text=''):
+    response = MagicMock()
+    response.status_code = status_code
+    response.code = '' if status_code == 200 else 'Error'
+    response.output.choices[0].message.content = text
+    return response
+
+
+@pytest.fixture
+def generation(monkeypatch):
+    """Provide a mocked dashscope Generation API."""
+    api = MagicMock()
+    monkeypatch.setattr(summary_generator, '_generation_api', lambda: api)
+    monkeypatch.setattr(summary_generator, '_aio_generation_api', lambda: None)
+    monkeypatch.setattr(summary_generator, '_session_kwargs', lambda: {})
+    with patch('llm_test.summary_generator.time.sleep'):
+        yield api
+
+
+def _reply(combined_text):
+    """Answer combined requests with combined_text, single ones with '单篇' + article letter."""
+    def call(**kwargs):
+        system, user = kwargs['messages']
+        if system['content'] == summary_generator._COMBINED_SYSTEM_PROMPT:
+            return _response(200, combined_text)
+        return _response(200, '单篇' + user['content'][-1])
+    return call
+
+
+class TestRetry:
+    def test_throttled_call_is_retried(self, generation):
+        generation.call.side_effect = [_response(429), _response(200, '摘要')]
+
+        assert generate_summary('正文', config=CONFIG) == '摘要'
+        assert generation.call.call_count == 2
+
+    def test_timeout_is_retried(self, generation):
+        generation.call.side_effect = [requests.Timeout(), _response(200, '摘要')]
+
+        assert generate_summary('正文', config=CONFIG) == '摘要'
+        assert generation.call.call_count == 2
+
+    def test_client_error_not_retried(self, generation):
+        generation.call.return_value = _response(400)
+
+        with pytest.raises(RuntimeError):
+            generate_summary('正文', config=CONFIG)
+        generation.call.assert_called_once()
+
+    def test_gives_up_after_attempts(self, generation):
+        generation.call.return_value = _response(503)
+
+        with pytest.raises(RuntimeError):
+            generate_summary('正文', config=CONFIG)
+        assert generation.call.call_count == summary_generator.MAX_ATTEMPTS
+
+    def test_gives_up_after_repeated_timeouts(self, generation):
+        generation.call.side_effect = requests.Timeout()
+
+        with pytest.raises(RuntimeError):
+            generate_summary('正文', config=CONFIG)
+        assert generation.call.call_count == summary_generator.MAX_ATTEMPTS
+
+
+class TestRateLimiter:
+    @patch('llm_test.summary_generator.time.sleep')
+    @patch('llm_test.summary_generator.time.monotonic', return_value=100.0)
+    def test_calls_are_spaced(self, mock_monotonic, mock_sleep):
+        limiter = _RateLimiter(120)
+        for _ in range(3):
+            limiter.wait()
+
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        assert delays == [0.5, 1.0]
+
+
+class TestSummaryCache:
+    def test_roundtrip(self):
+        _cache_put('k', '摘要')
+        assert _cache_get('k') == '摘要'
+
+    def test_missing_key(self):
+        assert _cache_get('missing') is None
+
+    def test_expired_entry_ignored(self, monkeypatch):
+        monkeypatch.setattr(summary_generator.time, 'time', lambda: 1000.0)
+        _cache_put('k', '摘要')
+        monkeypatch.setattr(
+            summary_generator.time, 'time', lambda: 1000.0 + summary_generator.SUMMARY_CACHE_TTL + 1,
+        )
+        assert _cache_get('k') is None
+
+    def test_key_depends_on_model_and_prompt(self):
+        messages = _build_messages('正文', '标题')
+        assert _cache_key('qwen-turbo', messages) == _cache_key('qwen-turbo', _build_messages('正文', '标题'))
+        assert _cache_key('qwen-turbo', messages) != _cache_key('qwen-plus', messages)
+        assert _cache_key('qwen-turbo', messages) != _cache_key('qwen-turbo', _build_messages('正文', '其他'))
+
+    def test_generate_summary_uses_cache(self, generation):
+        generation.call.return_value = _response(200, ' 摘要 ')
+
+        assert generate_summary('正文', '标题', config=CONFIG) == '摘要'
+        assert generate_summary('正文', '标题', config=CONFIG) == '摘要'
+        generation.call.assert_called_once()
+
+        assert generate_summary('正文', '标题', config=CONFIG, use_cache=False) == '摘要'
+        assert generation.call.call_count == 2
+
+
+class TestParseCombinedSummaries:
+    def test_fenced_json(self):
+        text = '```json\n[{"i": 0, "summary": " A "}, {"i": 1, "summary": "B"}]\n```'
+        assert _parse_combined_summaries(text, 2) == {0: 'A', 1: 'B'}
+
+    def test_invalid_entries_skipped(self):
+        text = '[{"i": 5, "summary": "X"}, {"i": "x"}, "text", {"i": 1, "summary": ""}]'
+        assert _parse_combined_summaries(text, 2) == {}
+
+
+class TestGenerateSummariesCombined:
+    def test_well_formed_reply(self, generation):
+        generation.call.side_effect = _reply(json.dumps(
+            [{'i': i, 'summary': f'合并{i}'} for i in range(3)]
+        ))
+
+        assert generate_summaries_combined(ITEMS, config=CONFIG) == ['合并0', '合并1', '合并2']
+        generation.call.assert_called_once()
+
+        # Served from the cache on the next run
+        assert generate_summaries_combined(ITEMS, config=CONFIG) == ['合并0', '合并1', '合并2']
+        generation.call.assert_called_once()
+
+    def test_combined_result_not_used_by_generate_summary(self, generation):
+        generation.call.side_effect = _reply(json.dumps(
+            [{'i': i, 'summary': f'合并{i}'} for i in range(3)]
+        ))
+        generate_summaries_combined(ITEMS, config=CONFIG)
+
+        assert generate_summary('正文A', '标题A', config=CONFIG) == '单篇A'
+
+    def test_malformed_reply_falls_back(self, generation):
+        generation.call.side_effect = _reply('这不是 JSON')
+
+        assert generate_summaries_combined(ITEMS, config=CONFIG) == ['单篇A', '单篇B', '单篇C']
+        assert generation.call.call_count == 4
+
+    def test_short_array_falls_back_for_missing(self, generation):
+        generation.call.side_effect = _reply('[{"i": 0, "summary": "合并0"}]')
+
+        assert generate_summaries_combined(ITEMS, config=CONFIG) == ['合并0', '单篇B', '单篇C']
+        assert generation.call.call_count == 3